@@ -3,6 +3,9 @@ Playwright Web Scraper - Agent Package
 
 Este pacote contém os módulos principais do scraper:
 - scraper.py: Lógica de coleta de dados
+- browser_pool.py: Pool de navegadores reaproveitados entre scrapes
+- engines/: Coleta de páginas estáticas sem navegador (httpx)
+- util.py: Utilitários compartilhados (validação de URL)
 - storage.py: Persistência de dados (CSV/SQLite)
 - llm_refiner.py: Refinamento com IA (opcional)
 """
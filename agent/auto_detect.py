@@ -6,11 +6,19 @@ Combina templates conhecidos + heurística inteligente.
 """
 
 import logging
-from typing import Dict, Optional
-from urllib.parse import urlparse
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional, Tuple
+from urllib.parse import urlsplit
 
 logger = logging.getLogger(__name__)
 
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
 
 # Templates para sites populares
 SITE_TEMPLATES = {
@@ -137,9 +145,248 @@ SITE_TEMPLATES = {
 }
 
 
+# Congela os templates: são devolvidos diretamente, sem cópia por chamada
+SITE_TEMPLATES = {
+    domain: MappingProxyType(template)
+    for domain, template in SITE_TEMPLATES.items()
+}
+
+
+# Seletores genéricos do scraper, quando não há template nem detecção
+DEFAULT_SELECTORS = MappingProxyType({
+    'container': 'article, .post, .card, .item, .news-item, .athing, tr.athing',
+    'title': '.titleline > a, h1, h2, h3, .title, .headline',
+    'author': '.author, .byline, [rel="author"], .hnuser',
+    'date': 'time, .date, .published, .age',
+    'content': '.content, .description, .summary, p',
+    'link': 'a[href]',
+})
+
+# Tags semânticas básicas, tentadas quando o seletor de container não acha nada
+FALLBACK_CONTAINERS = ('article', 'section', 'div[class*="post"]', 'div[class*="item"]')
+
+
+# Seletores candidatos da heurística, em ordem de prioridade
+_SEMANTIC_CONTAINERS = ('article', 'section[class*="post"]', 'section[class*="item"]')
+_COMMON_CONTAINERS = (
+    '.post', '.card', '.item', '.entry', '.article-item',
+    '[class*="post"]', '[class*="card"]', '[class*="item"]',
+    '[class*="story"]', '[class*="content-item"]'
+)
+_HEADINGS = ('h1', 'h2', 'h3')
+_TITLE_CLASSES = ('.title', '.headline', '[class*="title"]', '[class*="heading"]')
+_AUTHOR_SELECTORS = (
+    '.author', '.byline', '[class*="author"]',
+    '[rel="author"]', '[itemprop="author"]',
+    '.meta-author', '.writer'
+)
+_DATE_SELECTORS = (
+    'time', '[datetime]', '.date', '.published',
+    '[class*="date"]', '[class*="time"]',
+    '.meta-date', '.timestamp'
+)
+_CONTENT_SELECTORS = (
+    '.content', '.description', '.summary', '.excerpt',
+    '[class*="content"]', '[class*="description"]',
+    'p', '.text'
+)
+
+# Argumento do page.evaluate, montado uma única vez (Playwright serializa listas)
+_CANDIDATES = {
+    'container': [*_SEMANTIC_CONTAINERS, *_COMMON_CONTAINERS],
+    'title': [*_HEADINGS, *_TITLE_CLASSES],
+    'author': list(_AUTHOR_SELECTORS),
+    'date': list(_DATE_SELECTORS),
+    'content': list(_CONTENT_SELECTORS),
+}
+
+# Seletores usados quando nenhum candidato é encontrado
+_FALLBACKS = {
+    'container': 'article, .post, .card, .item, .entry, section[class*="post"]',
+    'title': 'h1, h2, h3, .title, .headline',
+    'author': '.author, .byline, [rel="author"]',
+    'date': 'time, .date, .published',
+    'content': '.content, .description, .summary, p',
+}
+
+_LOG_LABELS = {
+    'container': '📦 Container',
+    'title': '📝 Título',
+    'author': '👤 Autor',
+    'date': '📅 Data',
+    'content': '📄 Conteúdo',
+}
+
+# Range razoável de items para um container
+_MIN_CONTAINERS = 3
+_MAX_CONTAINERS = 100
+
+# Argumento do _DETECT_JS
+_DETECT_ARGS = {
+    'cands': _CANDIDATES,
+    'fallbacks': _FALLBACKS,
+    'minCount': _MIN_CONTAINERS,
+    'maxCount': _MAX_CONTAINERS,
+}
+
+
+# Trie de domínios indexada por labels invertidos (ex: org -> wikipedia)
+_TRIE_LEAF = '__tpl__'
+_TEMPLATE_TRIE: Optional[Dict] = None
+
+
+def _get_template_trie() -> Dict:
+    """
+    Retorna a trie de templates, construindo-a na primeira chamada.
+    
+    Cada nó é um dict de label -> nó filho; nós que fecham um domínio
+    de SITE_TEMPLATES guardam (domínio, template) na chave _TRIE_LEAF.
+    """
+    global _TEMPLATE_TRIE
+    
+    if _TEMPLATE_TRIE is None:
+        trie: Dict = {}
+        for template_domain, template in SITE_TEMPLATES.items():
+            node = trie
+            for label in reversed(template_domain.split('.')):
+                node = node.setdefault(label, {})
+            node[_TRIE_LEAF] = (template_domain, template)
+        _TEMPLATE_TRIE = trie
+    
+    return _TEMPLATE_TRIE
+
+
+_TEMPLATE_AUTOMATON = None
+
+
+def _get_template_automaton():
+    """
+    Retorna o autômato Aho-Corasick dos templates (requer pyahocorasick),
+    construindo-o na primeira chamada.
+    
+    As chaves são os domínios com labels invertidos e delimitados por
+    pontos (ex: .org.wikipedia.), para que só casem labels inteiros.
+    """
+    global _TEMPLATE_AUTOMATON
+    
+    if _TEMPLATE_AUTOMATON is None:
+        automaton = ahocorasick.Automaton()
+        for template_domain, template in SITE_TEMPLATES.items():
+            key = _reversed_key(template_domain)
+            automaton.add_word(key, (len(key), template_domain, template))
+        automaton.make_automaton()
+        _TEMPLATE_AUTOMATON = automaton
+    
+    return _TEMPLATE_AUTOMATON
+
+
+def _reversed_key(domain: str) -> str:
+    """en.wikipedia.org -> .org.wikipedia.en."""
+    return '.' + '.'.join(reversed(domain.split('.'))) + '.'
+
+
+def _match_template(domain: str) -> Optional[Tuple[str, Mapping[str, str]]]:
+    """
+    Encontra o template do maior sufixo de domínio registrado.
+    
+    Usa Aho-Corasick quando pyahocorasick está instalado e a trie em
+    Python puro caso contrário.
+    
+    Returns:
+        (domínio do template, template) ou None
+    """
+    if AHOCORASICK_AVAILABLE:
+        match = None
+        for end, (length, template_domain, template) in _get_template_automaton().iter(
+            _reversed_key(domain)
+        ):
+            # Só vale match ancorado no início (sufixo do domínio original)
+            if end + 1 == length:
+                match = (template_domain, template)
+        return match
+    
+    # Percorre a trie pelos labels invertidos e guarda o sufixo mais longo
+    # (ex: en.wikipedia.org -> wikipedia.org)
+    node = _get_template_trie()
+    match = None
+    
+    for label in reversed(domain.split('.')):
+        node = node.get(label)
+        if node is None:
+            break
+        if _TRIE_LEAF in node:
+            match = node[_TRIE_LEAF]
+    
+    return match
+
+
+@lru_cache(maxsize=4096)
+def _domain_of(url: str) -> str:
+    """Extrai domínio da URL (minúsculo, sem porta, credenciais nem www.)"""
+    try:
+        domain = urlsplit(url).hostname or ''
+    except ValueError:
+        return ''
+    
+    # Remove www.
+    if domain.startswith('www.'):
+        domain = domain[4:]
+        
+    return domain
+
+
+@lru_cache(maxsize=4096)
+def _template_for_domain(domain: str) -> Optional[Mapping[str, str]]:
+    """
+    Resolve o template de um domínio (memoizado entre páginas do mesmo site).
+    
+    Returns:
+        Visão somente leitura do template, ou None. Quem precisar
+        alterar o resultado deve copiá-lo com dict(...).
+    """
+    match = _match_template(domain)
+    if match is None:
+        return None
+    
+    template_domain, template = match
+    if template_domain != domain:
+        logger.info(f"📌 Match parcial: {template_domain}")
+    
+    return template
+
+
 class AutoDetector:
     """Detecta automaticamente seletores CSS para um site"""
     
+    # Escolhe os seletores no navegador: para cada categoria, o primeiro
+    # candidato válido (container com minCount..maxCount elementos, demais
+    # com ao menos um match) ou o fallback. Seletores que o navegador não
+    # aceita contam como -1 e são devolvidos em `invalid`.
+    _DETECT_JS = """
+    ({cands, fallbacks, minCount, maxCount}) => {
+        const invalid = [];
+        const qsa = window.__scraperQSA || ((s) => document.querySelectorAll(s));
+        const probe = (s, countAll) => {
+            try {
+                if (countAll) return qsa(s).length;
+                return document.querySelector(s) !== null ? 1 : 0;
+            } catch (e) {
+                invalid.push(s);
+                return -1;
+            }
+        };
+        const selectors = {};
+        for (const [key, sels] of Object.entries(cands)) {
+            const found = key === 'container'
+                ? sels.find(s => { const n = probe(s, true); return n >= minCount && n <= maxCount; })
+                : sels.find(s => probe(s, false) > 0);
+            selectors[key] = found ?? fallbacks[key];
+        }
+        selectors.link = 'a[href]';
+        return {selectors, invalid};
+    }
+    """
+    
     def __init__(self, page):
         """
         Args:
@@ -147,20 +394,9 @@ class AutoDetector:
         """
         self.page = page
         self.url = page.url
-        self.domain = self._extract_domain(self.url)
-        
-    def _extract_domain(self, url: str) -> str:
-        """Extrai domínio da URL"""
-        parsed = urlparse(url)
-        domain = parsed.netloc
-        
-        # Remove www.
-        if domain.startswith('www.'):
-            domain = domain[4:]
-            
-        return domain
+        self.domain = _domain_of(self.url)
     
-    def detect(self) -> Dict[str, str]:
+    def detect(self) -> Mapping[str, str]:
         """
         Detecta seletores automaticamente.
         
@@ -181,24 +417,33 @@ class AutoDetector:
         
         return heuristic
     
-    def _try_template(self) -> Optional[Dict[str, str]]:
+    async def detect_async(self) -> Mapping[str, str]:
         """
-        Tenta encontrar template para o domínio.
+        Versão de detect() para páginas da API assíncrona do Playwright.
         
         Returns:
-            Template se encontrado, None caso contrário
+            Dicionário com seletores detectados
         """
-        # Busca exata
-        if self.domain in SITE_TEMPLATES:
-            return SITE_TEMPLATES[self.domain].copy()
+        logger.info(f"🔍 Auto-detectando seletores para: {self.domain}")
         
-        # Busca parcial (ex: en.wikipedia.org -> wikipedia.org)
-        for template_domain in SITE_TEMPLATES:
-            if template_domain in self.domain:
-                logger.info(f"📌 Match parcial: {template_domain}")
-                return SITE_TEMPLATES[template_domain].copy()
+        template = self._try_template()
+        if template:
+            logger.info(f"✅ Template encontrado para {self.domain}")
+            return template
         
-        return None
+        logger.info("🧠 Usando detecção heurística...")
+        result = await self.page.evaluate(self._DETECT_JS, _DETECT_ARGS)
+        
+        return self._read_detection(result)
+    
+    def _try_template(self) -> Optional[Mapping[str, str]]:
+        """
+        Tenta encontrar template para o domínio.
+        
+        Returns:
+            Template (somente leitura) se encontrado, None caso contrário
+        """
+        return _template_for_domain(self.domain)
     
     def _heuristic_detection(self) -> Dict[str, str]:
         """
@@ -209,154 +454,31 @@ class AutoDetector:
         2. Tenta classes comuns (post, card, item)
         3. Analisa estrutura do DOM
         4. Fallback para padrões genéricos
-        """
-        selectors = {
-            'container': '',
-            'title': '',
-            'author': '',
-            'date': '',
-            'content': '',
-            'link': 'a[href]'
-        }
-        
-        # 1. Detecta container
-        selectors['container'] = self._detect_container()
-        
-        # 2. Detecta título (relativo ao container)
-        selectors['title'] = self._detect_title()
-        
-        # 3. Detecta autor
-        selectors['author'] = self._detect_author()
-        
-        # 4. Detecta data
-        selectors['date'] = self._detect_date()
-        
-        # 5. Detecta conteúdo
-        selectors['content'] = self._detect_content()
-        
-        return selectors
-    
-    def _detect_container(self) -> str:
-        """Detecta seletor de container principal"""
-        
-        # Prioridade: tags semânticas
-        semantic_tags = ['article', 'section[class*="post"]', 'section[class*="item"]']
-        
-        for tag in semantic_tags:
-            count = len(self.page.query_selector_all(tag))
-            if 3 <= count <= 100:  # Range razoável de items
-                logger.info(f"📦 Container detectado: {tag} ({count} elementos)")
-                return tag
-        
-        # Classes comuns
-        common_classes = [
-            '.post', '.card', '.item', '.entry', '.article-item',
-            '[class*="post"]', '[class*="card"]', '[class*="item"]',
-            '[class*="story"]', '[class*="content-item"]'
-        ]
-        
-        for selector in common_classes:
-            try:
-                count = len(self.page.query_selector_all(selector))
-                if 3 <= count <= 100:
-                    logger.info(f"📦 Container detectado: {selector} ({count} elementos)")
-                    return selector
-            except:
-                continue
-        
-        # Fallback: div com múltiplos filhos
-        logger.warning("⚠️ Container não detectado, usando fallback")
-        return 'article, .post, .card, .item, .entry, section[class*="post"]'
-    
-    def _detect_title(self) -> str:
-        """Detecta seletor de título"""
-        
-        # Headings são o mais comum
-        headings = ['h1', 'h2', 'h3']
-        
-        for heading in headings:
-            count = len(self.page.query_selector_all(heading))
-            if count > 0:
-                logger.info(f"📝 Título detectado: {heading}")
-                return heading
-        
-        # Classes comuns
-        title_classes = ['.title', '.headline', '[class*="title"]', '[class*="heading"]']
-        
-        for selector in title_classes:
-            try:
-                count = len(self.page.query_selector_all(selector))
-                if count > 0:
-                    logger.info(f"📝 Título detectado: {selector}")
-                    return selector
-            except:
-                continue
-        
-        # Fallback
-        return 'h1, h2, h3, .title, .headline'
-    
-    def _detect_author(self) -> str:
-        """Detecta seletor de autor"""
-        
-        author_selectors = [
-            '.author', '.byline', '[class*="author"]',
-            '[rel="author"]', '[itemprop="author"]',
-            '.meta-author', '.writer'
-        ]
-        
-        for selector in author_selectors:
-            try:
-                count = len(self.page.query_selector_all(selector))
-                if count > 0:
-                    logger.info(f"👤 Autor detectado: {selector}")
-                    return selector
-            except:
-                continue
         
-        return '.author, .byline, [rel="author"]'
-    
-    def _detect_date(self) -> str:
-        """Detecta seletor de data"""
-        
-        date_selectors = [
-            'time', '[datetime]', '.date', '.published',
-            '[class*="date"]', '[class*="time"]',
-            '.meta-date', '.timestamp'
-        ]
-        
-        for selector in date_selectors:
-            try:
-                count = len(self.page.query_selector_all(selector))
-                if count > 0:
-                    logger.info(f"📅 Data detectada: {selector}")
-                    return selector
-            except:
-                continue
-        
-        return 'time, .date, .published'
+        Toda a pontuação roda no navegador (_DETECT_JS), numa única
+        chamada a page.evaluate.
+        """
+        result = self.page.evaluate(self._DETECT_JS, _DETECT_ARGS)
+        return self._read_detection(result)
     
-    def _detect_content(self) -> str:
-        """Detecta seletor de conteúdo"""
+    @staticmethod
+    def _read_detection(result: Dict) -> Dict[str, str]:
+        """Registra e devolve os seletores escolhidos pelo _DETECT_JS"""
+        selectors = result['selectors']
         
-        content_selectors = [
-            '.content', '.description', '.summary', '.excerpt',
-            '[class*="content"]', '[class*="description"]',
-            'p', '.text'
-        ]
+        if result['invalid']:
+            logger.debug("Seletores ignorados pelo navegador: %s", result['invalid'])
         
-        for selector in content_selectors:
-            try:
-                count = len(self.page.query_selector_all(selector))
-                if count > 0:
-                    logger.info(f"📄 Conteúdo detectado: {selector}")
-                    return selector
-            except:
-                continue
+        for key, label in _LOG_LABELS.items():
+            if selectors[key] != _FALLBACKS[key]:
+                logger.info(f"{label} detectado: {selectors[key]}")
+            elif key == 'container':
+                logger.warning("⚠️ Container não detectado, usando fallback")
         
-        return '.content, .description, .summary, p'
+        return selectors
 
 
-def auto_detect_selectors(page) -> Dict[str, str]:
+def auto_detect_selectors(page) -> Mapping[str, str]:
     """
     Função helper para auto-detecção.
     
@@ -368,3 +490,30 @@ def auto_detect_selectors(page) -> Dict[str, str]:
     """
     detector = AutoDetector(page)
     return detector.detect()
+
+
+async def async_auto_detect_selectors(page) -> Mapping[str, str]:
+    """
+    Função helper para auto-detecção com a API assíncrona do Playwright.
+    
+    Args:
+        page: Página do Playwright (async)
+        
+    Returns:
+        Dicionário com seletores detectados
+    """
+    detector = AutoDetector(page)
+    return await detector.detect_async()
+
+
+def template_for_url(url: str) -> Optional[Mapping[str, str]]:
+    """
+    Template conhecido para a URL, sem precisar de uma página aberta.
+    
+    Args:
+        url: URL alvo
+        
+    Returns:
+        Template (somente leitura) se o domínio for conhecido, None caso contrário
+    """
+    return _template_for_domain(_domain_of(url))
@@ -0,0 +1,244 @@
+"""
+Browser Pool Module
+
+Pool de navegadores do Playwright (API síncrona), reaproveitados
+entre scrapes para evitar iniciar um navegador novo a cada execução.
+Cada scrape recebe um contexto novo, fechado ao final.
+"""
+
+import atexit
+import logging
+import queue
+import threading
+from concurrent.futures import Future
+from typing import Callable, Dict, List, Optional
+from playwright.sync_api import sync_playwright, Browser, BrowserContext
+
+logger = logging.getLogger(__name__)
+
+
+class _PoolState:
+    """Estado do BrowserPool para uma thread"""
+    
+    def __init__(self):
+        self.owner = threading.current_thread()
+        self.playwright = None
+        self.browsers: Dict[tuple, Browser] = {}
+        self.shared: set = set()
+
+
+class BrowserPool:
+    """
+    Pool de navegadores reaproveitados entre scrapes.
+    
+    Mantém um navegador por (browser_type, headless, cdp_endpoint). Só o
+    navegador é reaproveitado: acquire() sempre cria um contexto novo e
+    release() o fecha, então cookies, localStorage, IndexedDB, permissões
+    e logins de um scrape não chegam ao próximo. Como objetos da API
+    síncrona do Playwright só podem ser usados na thread que os criou,
+    cada thread tem seu próprio conjunto de navegadores, e cada thread
+    deve chamar close() antes de terminar (ver BrowserThread).
+    """
+    
+    BROWSER_TYPES = ("chromium", "firefox", "webkit")
+    
+    def __init__(self):
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._states: List[_PoolState] = []
+    
+    def _state(self) -> _PoolState:
+        """Estado da thread atual (registrado para o close_all)"""
+        state = getattr(self._local, 'state', None)
+        if state is None:
+            state = self._local.state = _PoolState()
+            with self._lock:
+                self._states.append(state)
+        return state
+    
+    def _get_browser(
+        self,
+        state: _PoolState,
+        browser_type: str,
+        headless: bool,
+        cdp_endpoint: Optional[str] = None
+    ) -> Browser:
+        """Retorna o navegador da thread, iniciando-o (ou conectando) se necessário"""
+        key = (browser_type, headless, cdp_endpoint)
+        browser = state.browsers.get(key)
+        
+        if browser is None or not browser.is_connected():
+            if state.playwright is None:
+                state.playwright = sync_playwright().start()
+            
+            if cdp_endpoint:
+                logger.info(f"Conectando ao navegador compartilhado em {cdp_endpoint} (pool)")
+                browser = state.playwright.chromium.connect_over_cdp(cdp_endpoint)
+                state.shared.add(key)
+            else:
+                logger.info(f"Iniciando navegador {browser_type} (headless={headless}) no pool")
+                browser = getattr(state.playwright, browser_type).launch(headless=headless)
+            state.browsers[key] = browser
+        
+        return browser
+    
+    def acquire(
+        self,
+        browser_type: str,
+        headless: bool,
+        context_options: Dict,
+        cdp_endpoint: Optional[str] = None
+    ) -> BrowserContext:
+        """
+        Cria um contexto novo no navegador do pool.
+        
+        Args:
+            browser_type: Tipo do navegador (chromium, firefox, webkit)
+            headless: Se True, executa sem interface gráfica
+            context_options: Opções de browser.new_context()
+            cdp_endpoint: Endpoint CDP de um navegador já aberto (só chromium)
+        
+        Returns:
+            Contexto do navegador (devolva com release())
+        """
+        if browser_type not in self.BROWSER_TYPES:
+            raise ValueError(f"Tipo de navegador inválido: {browser_type}")
+        
+        browser = self._get_browser(self._state(), browser_type, headless, cdp_endpoint)
+        return browser.new_context(**context_options)
+    
+    def release(self, context: BrowserContext):
+        """
+        Fecha o contexto; o navegador continua aberto no pool.
+        
+        Nunca levanta exceção: se o navegador caiu, o contexto já
+        está perdido e o próximo acquire() inicia outro navegador.
+        
+        Args:
+            context: Contexto obtido com acquire()
+        """
+        try:
+            context.close()
+        except Exception as e:
+            logger.debug("Erro ao fechar contexto do pool: %s", e)
+    
+    def close(self):
+        """Fecha os navegadores da thread atual"""
+        state = getattr(self._local, 'state', None)
+        if state is None:
+            return
+        
+        self._local.state = None
+        with self._lock:
+            if state in self._states:
+                self._states.remove(state)
+        
+        self._close_state(state)
+    
+    def close_all(self):
+        """
+        Fecha os navegadores da thread atual (registrado no atexit).
+        
+        Navegadores de outras threads não podem ser usados daqui: cada
+        thread fecha os seus com close() (a BrowserThread faz isso ao
+        encerrar). Os que sobrarem terminam junto com o driver do
+        Playwright quando o processo sai.
+        """
+        current = threading.current_thread()
+        
+        with self._lock:
+            others = [state for state in self._states if state.owner is not current]
+        if others:
+            logger.debug("%d thread(s) não fecharam o pool de navegadores", len(others))
+        
+        self.close()
+    
+    @staticmethod
+    def _close_state(state: _PoolState):
+        """Fecha navegadores e Playwright de um estado (na thread dona)"""
+        try:
+            for key, browser in state.browsers.items():
+                # Navegadores compartilhados via CDP continuam abertos
+                # para os outros processos; só a conexão é encerrada
+                if key not in state.shared:
+                    browser.close()
+            if state.playwright:
+                state.playwright.stop()
+        except Exception as e:
+            logger.debug("Erro ao fechar o pool de navegadores: %s", e)
+
+
+# Pool compartilhado pelos WebScraper do processo (use_pool=True)
+POOL = BrowserPool()
+atexit.register(POOL.close_all)
+
+
+class BrowserThread:
+    """
+    Thread dedicada às chamadas do Playwright com o POOL.
+    
+    Para quem roda cada chamada numa thread diferente (ex: reruns do
+    Streamlit): tudo passa por esta thread, então o navegador do pool
+    continua aberto entre as chamadas. Ao encerrar (shutdown() ou fim do
+    processo), a própria thread fecha seus navegadores com pool.close().
+    """
+    
+    def __init__(self, pool: BrowserPool = POOL, name: str = "playwright"):
+        self._pool = pool
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._shutdown_lock = threading.Lock()
+        self._closed = False
+        
+        # Daemon: continua rodando durante o atexit, que pede o shutdown()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+        atexit.register(self.shutdown)
+    
+    def submit(self, fn: Callable, *args, **kwargs) -> Future:
+        """
+        Agenda fn(*args, **kwargs) na thread.
+        
+        Returns:
+            Future com o resultado (ou a exceção) de fn
+            
+        Raises:
+            RuntimeError: Se a thread já foi encerrada
+        """
+        future = Future()
+        with self._shutdown_lock:
+            if self._closed:
+                raise RuntimeError("BrowserThread já encerrada")
+            self._queue.put((future, fn, args, kwargs))
+        return future
+    
+    def shutdown(self, timeout: float = 30.0):
+        """
+        Termina as chamadas pendentes, fecha os navegadores da thread e a encerra.
+        
+        Args:
+            timeout: Espera máxima pelo encerramento (segundos)
+        """
+        with self._shutdown_lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(None)
+        
+        self._thread.join(timeout)
+    
+    def _run(self):
+        """Loop da thread: executa as chamadas até o shutdown()"""
+        while True:
+            job = self._queue.get()
+            if job is None:
+                break
+            
+            future, fn, args, kwargs = job
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(fn(*args, **kwargs))
+            except BaseException as e:
+                future.set_exception(e)
+        
+        self._pool.close()
@@ -0,0 +1,10 @@
+"""
+Engines
+
+Alternativas ao navegador para coletar páginas:
+- httpx_engine.py: HTML estático via httpx + selectolax (sem JavaScript)
+"""
+
+from .httpx_engine import HttpxScraper, scrape_static, HTTPX_ENGINE_AVAILABLE
+
+__all__ = ['HttpxScraper', 'scrape_static', 'HTTPX_ENGINE_AVAILABLE']
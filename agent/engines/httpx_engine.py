@@ -0,0 +1,259 @@
+"""
+HTTPX Engine
+
+Coleta de páginas estáticas sem navegador: baixa o HTML com httpx e
+extrai os itens com selectolax, usando os mesmos seletores e a mesma
+lógica de campos do WebScraper. Não executa JavaScript; páginas
+renderizadas no cliente devem usar o WebScraper (ver --engine auto).
+"""
+
+import json
+import logging
+from typing import Dict, List, Optional
+from urllib.parse import urljoin
+
+from ..auto_detect import DEFAULT_SELECTORS, FALLBACK_CONTAINERS, template_for_url
+
+try:
+    import httpx
+    from selectolax.parser import HTMLParser
+    HTTPX_ENGINE_AVAILABLE = True
+except ImportError:
+    HTTPX_ENGINE_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+# User-Agent de navegador: muitos sites recusam o padrão do httpx
+DEFAULT_USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+)
+
+
+class HttpxScraper:
+    """
+    Scraper de HTML estático (httpx + selectolax).
+    
+    Mesma interface de extração do WebScraper (SELECTORS, extract_data),
+    sem navegador: uma requisição HTTP por página.
+    """
+    
+    SELECTORS = dict(DEFAULT_SELECTORS)
+    
+    def __init__(
+        self,
+        timeout: float = 10.0,
+        user_agent: str = None,
+        auto_detect: bool = True,
+        storage_state: Optional[str] = None
+    ):
+        """
+        Inicializa o cliente HTTP.
+        
+        Args:
+            timeout: Timeout das requisições em segundos
+            user_agent: User-Agent customizado
+            auto_detect: Se True, usa o template do site quando houver
+            storage_state: Caminho do storage_state.json (os cookies são enviados)
+        """
+        if not HTTPX_ENGINE_AVAILABLE:
+            raise ImportError("Engine httpx indisponível. Execute: pip install httpx selectolax")
+        
+        self.auto_detect = auto_detect
+        
+        # Cópia por instância: seletores customizados não vazam para a classe
+        self.SELECTORS = dict(type(self).SELECTORS)
+        
+        self.client = httpx.Client(
+            timeout=timeout,
+            follow_redirects=True,
+            headers={"User-Agent": user_agent or DEFAULT_USER_AGENT}
+        )
+        
+        if storage_state:
+            self._load_cookies(storage_state)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+    
+    def _load_cookies(self, storage_state: str):
+        """Carrega os cookies de um storage_state do Playwright"""
+        with open(storage_state, encoding='utf-8') as f:
+            state = json.load(f)
+        
+        for cookie in state.get('cookies', []):
+            self.client.cookies.set(
+                cookie['name'],
+                cookie['value'],
+                domain=cookie.get('domain', ''),
+                path=cookie.get('path', '/')
+            )
+        
+        logger.info(f"Cookies carregados de: {storage_state}")
+    
+    def scrape(self, url: str, max_items: Optional[int] = None) -> List[Dict[str, str]]:
+        """
+        Baixa a página e extrai os itens.
+        
+        Args:
+            url: URL alvo
+            max_items: Número máximo de itens
+        
+        Returns:
+            Lista de dicionários com dados coletados (vazia em caso de erro)
+        """
+        try:
+            response = self.client.get(url)
+            response.raise_for_status()
+        except httpx.HTTPError as e:
+            logger.error(f"Erro ao baixar {url}: {str(e)}")
+            return []
+        
+        logger.info(f"Página baixada: {url} (status {response.status_code}, {len(response.content)} bytes)")
+        
+        return self.extract_data(response.text, str(response.url), max_items)
+    
+    def extract_data(
+        self,
+        html: str,
+        url: str,
+        max_items: Optional[int] = None
+    ) -> List[Dict[str, str]]:
+        """
+        Extrai os itens de um HTML (mesma lógica do _ITEM_JS do WebScraper).
+        
+        Args:
+            html: Conteúdo da página
+            url: URL da página (base dos links relativos e do template)
+            max_items: Número máximo de itens
+        
+        Returns:
+            Lista de dicionários com os dados coletados
+        """
+        selectors = dict(self.SELECTORS)
+        
+        if self.auto_detect:
+            template = template_for_url(url)
+            if template:
+                logger.info("✅ Template do site aplicado")
+                selectors.update({k: v for k, v in template.items() if v})
+        
+        tree = HTMLParser(html)
+        
+        containers = _css(tree, selectors['container'])
+        if not containers:
+            for fallback in FALLBACK_CONTAINERS:
+                containers = _css(tree, fallback)
+                if containers:
+                    logger.warning("⚠️ Nenhum container encontrado com seletores atuais")
+                    logger.info(f"✅ Encontrados {len(containers)} com {fallback}")
+                    break
+        else:
+            logger.info(f"Encontrados {len(containers)} containers na página")
+        
+        if max_items:
+            containers = containers[:max_items]
+        
+        data = []
+        for container in containers:
+            item = _extract_item(container, selectors)
+            
+            # Só mantém itens com pelo menos título ou link
+            if not (item.get('title') or item.get('link')):
+                continue
+            
+            if item.get('link'):
+                item['link'] = urljoin(url, item['link'])
+            
+            data.append(item)
+        
+        logger.info(f"Extração concluída: {len(data)} itens coletados")
+        
+        return data
+    
+    def close(self):
+        """Fecha o cliente HTTP"""
+        self.client.close()
+
+
+def _css(node, selector: str) -> list:
+    """node.css tratando seletores vazios ou inválidos como "sem match" """
+    if not selector:
+        return []
+    try:
+        return node.css(selector)
+    except Exception:
+        return []
+
+
+def _css_first(node, selector: str):
+    """Primeiro match de node.css, ou None"""
+    found = _css(node, selector)
+    return found[0] if found else None
+
+
+def _text(node) -> str:
+    """Texto do nó com espaços normalizados (aproxima o innerText)"""
+    return ' '.join(node.text(separator=' ').split())
+
+
+def _extract_item(container, selectors: Dict[str, str]) -> Dict[str, str]:
+    """Extrai os campos de um container"""
+    item = {}
+    
+    # Título (.titleline > a tem prioridade) e o link dele
+    title_el = _css_first(container, '.titleline > a') or _css_first(container, selectors['title'])
+    if title_el is not None:
+        item['title'] = _text(title_el)
+        href = title_el.attributes.get('href')
+        if href:
+            item['link'] = href
+    
+    author_el = _css_first(container, selectors['author'])
+    if author_el is not None:
+        item['author'] = _text(author_el)
+    
+    # Data: atributo datetime primeiro
+    date_el = _css_first(container, selectors['date'])
+    if date_el is not None:
+        item['date'] = date_el.attributes.get('datetime') or _text(date_el)
+    
+    content_el = _css_first(container, selectors['content'])
+    if content_el is not None:
+        item['content'] = _text(content_el)
+    
+    if 'link' not in item:
+        link_el = _css_first(container, selectors.get('link', ''))
+        href = link_el.attributes.get('href') if link_el is not None else None
+        if href:
+            item['link'] = href
+    
+    return item
+
+
+def scrape_static(
+    url: str,
+    max_items: Optional[int] = None,
+    storage_state: Optional[str] = None,
+    auto_detect: bool = True,
+    timeout: float = 10.0
+) -> List[Dict[str, str]]:
+    """
+    Função helper para scraping de HTML estático.
+    
+    Args:
+        url: URL alvo
+        max_items: Número máximo de itens
+        storage_state: Caminho para arquivo de autenticação
+        auto_detect: Se True, usa o template do site quando houver
+        timeout: Timeout da requisição em segundos
+    
+    Returns:
+        Lista de dicionários com dados coletados
+    """
+    with HttpxScraper(timeout=timeout, auto_detect=auto_detect, storage_state=storage_state) as scraper:
+        return scraper.scrape(url, max_items=max_items)
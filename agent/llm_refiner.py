@@ -9,20 +9,90 @@ Módulo opcional para refinar dados coletados usando IA (OpenAI).
 - Classificar ou categorizar dados
 """
 
+import asyncio
+import hashlib
+import json
 import logging
 import os
-from typing import List, Dict, Optional
+import re
+import sqlite3
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterator, List, Dict, Optional, Union
 
 logger = logging.getLogger(__name__)
 
 try:
-    from openai import OpenAI
+    from openai import AsyncOpenAI, OpenAI
     OPENAI_AVAILABLE = True
 except ImportError:
     OPENAI_AVAILABLE = False
     logger.warning("OpenAI não instalado. Execute: pip install openai")
 
 
+# Mensagem de sistema comum a todas as chamadas (não deve ser alterada)
+_SYS_MSG = {
+    "role": "system",
+    "content": "Você é um assistente que refina e melhora textos."
+}
+
+# Linha de lista numerada ("1.", "2)", "3-") ou com marcador ("-", "*", "•")
+_BULLET_RE = re.compile(r'^\s*(?:\d+[.)\-]?|[-*•])\s*(.+?)\s*$', re.M)
+
+_CLEAN_INSTRUCTION = (
+    "Limpe este texto removendo caracteres especiais desnecessários, "
+    "corrigindo formatação e mantendo apenas o conteúdo relevante:"
+)
+
+
+def _summary_instruction(max_words: int) -> str:
+    """Instrução de resumo"""
+    return f"Resuma este texto em no máximo {max_words} palavras:"
+
+
+def _key_points_instruction(num_points: int) -> str:
+    """Instrução de extração de pontos principais"""
+    return (
+        f"Extraia os {num_points} pontos principais deste texto. "
+        "Retorne apenas uma lista numerada, sem introdução."
+    )
+
+
+def _parse_key_points(result: str) -> List[str]:
+    """Converte a lista numerada devolvida pelo modelo em lista Python"""
+    return _BULLET_RE.findall(result)
+
+
+def _build_messages(text: str, instruction: str) -> List[Dict[str, str]]:
+    """Mensagens do chat para refinar um texto"""
+    return [_SYS_MSG, {"role": "user", "content": f"{instruction}\n\nTexto:\n{text}"}]
+
+
+def _operation_instruction(operation: str) -> Optional[str]:
+    """Instrução usada por refine_batch para cada operação"""
+    if operation == 'summarize':
+        return _summary_instruction(100)
+    elif operation == 'clean':
+        return _CLEAN_INSTRUCTION
+    elif operation == 'extract_points':
+        return _key_points_instruction(3)
+    return None
+
+
+def _apply_result(item: Dict[str, str], field: str, operation: str, result: str):
+    """Grava a resposta do modelo no item, no campo da operação"""
+    if operation == 'summarize':
+        item[f'{field}_summary'] = result
+    elif operation == 'clean':
+        item[f'{field}_cleaned'] = result
+    elif operation == 'extract_points':
+        item[f'{field}_key_points'] = ' | '.join(_parse_key_points(result))
+
+
 class LLMRefiner:
     """
     Refina dados coletados usando modelos de linguagem (OpenAI).
@@ -32,7 +102,9 @@ class LLMRefiner:
         self,
         api_key: Optional[str] = None,
         model: str = "gpt-4o-mini",
-        temperature: float = 0.3
+        temperature: float = 0.3,
+        cache_size: int = 4096,
+        cache_path: Optional[str] = None
     ):
         """
         Inicializa o refinador.
@@ -41,6 +113,8 @@ class LLMRefiner:
             api_key: Chave da API OpenAI (ou usa OPENAI_API_KEY do .env)
             model: Modelo a usar (gpt-4o-mini, gpt-4o, gpt-3.5-turbo)
             temperature: Criatividade (0-1, menor = mais determinístico)
+            cache_size: Máximo de respostas mantidas no cache em memória
+            cache_path: Banco SQLite opcional para persistir o cache entre execuções
         """
         if not OPENAI_AVAILABLE:
             raise ImportError("OpenAI não instalado. Execute: pip install openai")
@@ -57,6 +131,18 @@ class LLMRefiner:
         self.temperature = temperature
         self.client = OpenAI(api_key=self.api_key)
         
+        # Protege os caches: a instância de _get_refiner é compartilhada
+        # entre threads (ex: sessões do Streamlit)
+        self._lock = threading.Lock()
+        
+        # Cache de respostas: chave = hash(modelo, temperatura, instrução, texto)
+        self.cache_size = cache_size
+        self._cache: Dict[bytes, str] = {}
+        self._cache_db = self._open_cache_db(cache_path) if cache_path else None
+        
+        # Resultados já processados de summarize/clean_content/extract_key_points
+        self._op_cache: Dict[tuple, object] = {}
+        
         logger.info(f"LLM Refiner inicializado com modelo: {model}")
     
     def refine_text(self, text: str, instruction: str) -> str:
@@ -70,41 +156,198 @@ class LLMRefiner:
         Returns:
             Texto refinado
         """
+        key = self._cache_key(text, instruction)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
+        
         try:
             response = self.client.chat.completions.create(
                 model=self.model,
                 temperature=self.temperature,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "Você é um assistente que refina e melhora textos."
-                    },
-                    {
-                        "role": "user",
-                        "content": f"{instruction}\n\nTexto:\n{text}"
-                    }
-                ]
+                messages=_build_messages(text, instruction)
             )
             
-            return response.choices[0].message.content.strip()
+            result = response.choices[0].message.content.strip()
+            self._cache_put(key, result)
+            return result
             
         except Exception as e:
             logger.error(f"Erro ao refinar texto: {str(e)}")
             return text  # Retorna original em caso de erro
     
-    def summarize(self, text: str, max_words: int = 100) -> str:
+    def _cache_key(self, text: str, instruction: str) -> bytes:
+        """Chave estável do cache para os parâmetros do prompt"""
+        raw = "\0".join((self.model, str(self.temperature), instruction, text))
+        return hashlib.sha256(raw.encode('utf-8')).digest()
+    
+    def _cache_get(self, key: bytes) -> Optional[str]:
+        """Busca resposta no cache (memória, depois disco)"""
+        with self._lock:
+            result = self._cache.get(key)
+            
+            if result is None and self._cache_db is not None:
+                row = self._cache_db.execute(
+                    "SELECT value FROM responses WHERE key = ?", (key.hex(),)
+                ).fetchone()
+                if row:
+                    result = row[0]
+                    self._remember(key, result)
+        
+        return result
+    
+    def _cache_put(self, key: bytes, value: str):
+        """Guarda resposta no cache (memória e, se configurado, disco)"""
+        with self._lock:
+            self._remember(key, value)
+            
+            if self._cache_db is not None:
+                with self._cache_db:
+                    self._cache_db.execute(
+                        "INSERT OR REPLACE INTO responses (key, value) VALUES (?, ?)",
+                        (key.hex(), value)
+                    )
+    
+    def _remember(self, key: bytes, value: str):
+        """
+        Insere no cache em memória, descartando a entrada mais antiga se cheio.
+        
+        Chamar com self._lock adquirido.
+        """
+        if self.cache_size <= 0:
+            return
+        
+        if key not in self._cache and len(self._cache) >= self.cache_size:
+            del self._cache[next(iter(self._cache))]
+        
+        self._cache[key] = value
+    
+    @staticmethod
+    def _open_cache_db(cache_path: str) -> sqlite3.Connection:
+        """Abre (ou cria) o banco SQLite do cache de respostas"""
+        Path(cache_path).parent.mkdir(parents=True, exist_ok=True)
+        
+        conn = sqlite3.connect(cache_path, check_same_thread=False)
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, value TEXT)"
+        )
+        conn.commit()
+        
+        logger.info(f"Cache de respostas em disco: {cache_path}")
+        return conn
+    
+    async def _arefine_text(
+        self,
+        text: str,
+        instruction: str,
+        sem: asyncio.Semaphore,
+        client: "AsyncOpenAI"
+    ) -> str:
+        """
+        Versão assíncrona de refine_text, limitada pelo semáforo.
+        
+        Args:
+            text: Texto original
+            instruction: Instrução de como refinar
+            sem: Semáforo que limita as chamadas simultâneas
+            client: Cliente assíncrono do lote
+            
+        Returns:
+            Texto refinado
+            
+        Raises:
+            Exception: Erros da API são propagados para que _arefine_batch
+                os contabilize de uma vez
+        """
+        key = self._cache_key(text, instruction)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
+        
+        async with sem:
+            response = await client.chat.completions.create(
+                model=self.model,
+                temperature=self.temperature,
+                messages=_build_messages(text, instruction)
+            )
+        
+        result = response.choices[0].message.content.strip()
+        self._cache_put(key, result)
+        return result
+    
+    def refine_text_stream(self, text: str, instruction: str) -> Iterator[str]:
+        """
+        Refina um texto devolvendo a resposta em pedaços, à medida que o
+        modelo gera (stream=True).
+        
+        Args:
+            text: Texto original
+            instruction: Instrução de como refinar
+            
+        Yields:
+            Trechos do texto refinado (o texto original, se a API falhar
+            antes de enviar qualquer trecho)
+        """
+        key = self._cache_key(text, instruction)
+        cached = self._cache_get(key)
+        if cached is not None:
+            yield cached
+            return
+        
+        parts = []
+        
+        try:
+            response = self.client.chat.completions.create(
+                model=self.model,
+                temperature=self.temperature,
+                messages=_build_messages(text, instruction),
+                stream=True
+            )
+            
+            for chunk in response:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content or ""
+                if delta:
+                    parts.append(delta)
+                    yield delta
+            
+        except Exception as e:
+            logger.error(f"Erro ao refinar texto: {str(e)}")
+            if not parts:
+                yield text  # Retorna original em caso de erro
+            return
+        
+        self._cache_put(key, "".join(parts).strip())
+    
+    def summarize(
+        self,
+        text: str,
+        max_words: int = 100,
+        stream: bool = False
+    ) -> Union[str, Iterator[str]]:
         """
         Resume um texto.
         
         Args:
             text: Texto para resumir
             max_words: Número máximo de palavras
+            stream: Se True, devolve um iterador com os trechos do resumo
             
         Returns:
-            Resumo do texto
+            Resumo do texto (ou iterador de trechos, com stream=True)
         """
-        instruction = f"Resuma este texto em no máximo {max_words} palavras:"
-        return self.refine_text(text, instruction)
+        if stream:
+            return self.refine_text_stream(text, _summary_instruction(max_words))
+        
+        key = ('summarize', text, max_words)
+        cached = self._op_cache.get(key)
+        if cached is not None:
+            return cached
+        
+        result = self.refine_text(text, _summary_instruction(max_words))
+        self._memoize(key, text, result)
+        return result
     
     def extract_key_points(self, text: str, num_points: int = 3) -> List[str]:
         """
@@ -117,93 +360,257 @@ class LLMRefiner:
         Returns:
             Lista de pontos principais
         """
-        instruction = (
-            f"Extraia os {num_points} pontos principais deste texto. "
-            "Retorne apenas uma lista numerada, sem introdução."
-        )
-        
-        result = self.refine_text(text, instruction)
-        
-        # Parse da resposta em lista
-        points = []
-        for line in result.split('\n'):
-            line = line.strip()
-            if line and (line[0].isdigit() or line.startswith('-')):
-                # Remove numeração e adiciona
-                clean_line = line.lstrip('0123456789.-) ').strip()
-                if clean_line:
-                    points.append(clean_line)
+        key = ('extract_points', text, num_points)
+        cached = self._op_cache.get(key)
+        if cached is not None:
+            return list(cached)
         
+        result = self.refine_text(text, _key_points_instruction(num_points))
+        points = _parse_key_points(result)
+        self._memoize(key, text, result, tuple(points))
         return points
     
-    def clean_content(self, text: str) -> str:
+    def clean_content(self, text: str, stream: bool = False) -> Union[str, Iterator[str]]:
         """
         Limpa e formata um texto (remove ruído, corrige formatação).
         
         Args:
             text: Texto para limpar
+            stream: Se True, devolve um iterador com os trechos do texto limpo
             
         Returns:
-            Texto limpo
+            Texto limpo (ou iterador de trechos, com stream=True)
         """
-        instruction = (
-            "Limpe este texto removendo caracteres especiais desnecessários, "
-            "corrigindo formatação e mantendo apenas o conteúdo relevante:"
-        )
-        return self.refine_text(text, instruction)
+        if stream:
+            return self.refine_text_stream(text, _CLEAN_INSTRUCTION)
+        
+        key = ('clean', text)
+        cached = self._op_cache.get(key)
+        if cached is not None:
+            return cached
+        
+        result = self.refine_text(text, _CLEAN_INSTRUCTION)
+        self._memoize(key, text, result)
+        return result
+    
+    def _memoize(self, key: tuple, text: str, result: str, value=None):
+        """
+        Guarda o resultado de uma operação no cache por instância.
+        
+        Não memoiza quando refine_text devolveu o próprio texto original
+        (erro na API), para que a próxima chamada tente de novo.
+        """
+        if result is text or self.cache_size <= 0:
+            return
+        
+        with self._lock:
+            if key not in self._op_cache and len(self._op_cache) >= self.cache_size:
+                del self._op_cache[next(iter(self._op_cache))]
+            
+            self._op_cache[key] = result if value is None else value
     
     def refine_batch(
         self,
         data: List[Dict[str, str]],
         field: str = 'content',
-        operation: str = 'summarize'
+        operation: str = 'summarize',
+        concurrency: int = 8
     ) -> List[Dict[str, str]]:
         """
         Refina múltiplos itens de dados.
         
+        As chamadas à API são feitas em paralelo (até `concurrency` por vez).
+        
         Args:
             data: Lista de dicionários com os dados
             field: Campo a ser refinado
             operation: Operação ('summarize', 'clean', 'extract_points')
+            concurrency: Número máximo de chamadas simultâneas à API
+            
+        Returns:
+            Lista de dados refinados
+        """
+        coro = self._arefine_batch(data, field=field, operation=operation, concurrency=concurrency)
+        
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(coro)
+        
+        # Já há um loop rodando nesta thread (ex: depois de usar a API síncrona
+        # do Playwright): asyncio.run falharia aqui, então usa uma thread própria
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="llm-refiner") as executor:
+            return executor.submit(asyncio.run, coro).result()
+    
+    def refine_batch_large(
+        self,
+        data: List[Dict[str, str]],
+        field: str = 'content',
+        operation: str = 'summarize',
+        threshold: int = 200,
+        poll_interval: float = 30.0
+    ) -> List[Dict[str, str]]:
+        """
+        Refina muitos itens pela Batch API da OpenAI (metade do custo,
+        resultado em até 24h).
+        
+        Abaixo de `threshold` itens com texto, usa refine_batch.
+        
+        Args:
+            data: Lista de dicionários com os dados
+            field: Campo a ser refinado
+            operation: Operação ('summarize', 'clean', 'extract_points')
+            threshold: Mínimo de itens para usar a Batch API
+            poll_interval: Intervalo entre consultas de status (segundos)
+            
+        Returns:
+            Lista de dados refinados
+        """
+        instruction = _operation_instruction(operation)
+        pending = [
+            (idx, item) for idx, item in enumerate(data)
+            if item.get(field) and instruction is not None
+        ]
+        
+        if len(pending) < threshold:
+            return self.refine_batch(data, field=field, operation=operation)
+        
+        logger.info(f"Enviando {len(pending)} itens para a Batch API (operação: {operation})...")
+        
+        lines = []
+        for idx, item in pending:
+            lines.append(json.dumps({
+                "custom_id": str(idx),
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {
+                    "model": self.model,
+                    "temperature": self.temperature,
+                    "messages": _build_messages(item[field], instruction),
+                },
+            }, ensure_ascii=False))
+        
+        try:
+            batch_file = self.client.files.create(
+                file=("refine_batch.jsonl", "\n".join(lines).encode('utf-8')),
+                purpose="batch"
+            )
+            batch = self.client.batches.create(
+                input_file_id=batch_file.id,
+                endpoint="/v1/chat/completions",
+                completion_window="24h"
+            )
+            
+            while batch.status not in ("completed", "failed", "expired", "cancelled"):
+                logger.debug("Batch %s: %s", batch.id, batch.status)
+                time.sleep(poll_interval)
+                batch = self.client.batches.retrieve(batch.id)
+            
+            if batch.status != "completed" or not batch.output_file_id:
+                logger.error(f"Batch {batch.id} terminou com status: {batch.status}")
+                return data
+            
+            output = self.client.files.content(batch.output_file_id).text
+            
+        except Exception as e:
+            logger.error(f"Erro na Batch API: {str(e)}")
+            return data
+        
+        refined = 0
+        for line in output.splitlines():
+            if not line.strip():
+                continue
+            
+            record = json.loads(line)
+            response = record.get("response") or {}
+            if response.get("status_code") != 200:
+                logger.warning(f"Item {record.get('custom_id')}: {record.get('error')}")
+                continue
+            
+            item = data[int(record["custom_id"])]
+            result = response["body"]["choices"][0]["message"]["content"].strip()
+            self._cache_put(self._cache_key(item[field], instruction), result)
+            _apply_result(item, field, operation, result)
+            refined += 1
+        
+        logger.info(f"✅ Batch concluído: {refined}/{len(pending)} itens refinados")
+        return data
+    
+    async def _arefine_batch(
+        self,
+        data: List[Dict[str, str]],
+        field: str = 'content',
+        operation: str = 'summarize',
+        concurrency: int = 8
+    ) -> List[Dict[str, str]]:
+        """
+        Versão assíncrona de refine_batch.
+        
+        Args:
+            data: Lista de dicionários com os dados
+            field: Campo a ser refinado
+            operation: Operação ('summarize', 'clean', 'extract_points')
+            concurrency: Número máximo de chamadas simultâneas à API
             
         Returns:
             Lista de dados refinados
         """
         logger.info(f"Refinando {len(data)} itens (operação: {operation})...")
         
-        refined_data = []
+        # Agrupa itens com o mesmo texto: uma chamada à API por texto único
+        uniq: Dict[str, List[int]] = defaultdict(list)
+        for idx, item in enumerate(data):
+            text = item.get(field, '')
+            if text:
+                uniq[text].append(idx)
+            else:
+                logger.warning(f"Item {idx + 1}: campo '{field}' vazio")
         
-        for idx, item in enumerate(data, 1):
-            try:
-                text = item.get(field, '')
-                
-                if not text:
-                    logger.warning(f"Item {idx}: campo '{field}' vazio")
-                    refined_data.append(item)
-                    continue
-                
-                # Aplica operação
-                if operation == 'summarize':
-                    refined_text = self.summarize(text)
-                    item[f'{field}_summary'] = refined_text
-                    
-                elif operation == 'clean':
-                    refined_text = self.clean_content(text)
-                    item[f'{field}_cleaned'] = refined_text
-                    
-                elif operation == 'extract_points':
-                    points = self.extract_key_points(text)
-                    item[f'{field}_key_points'] = ' | '.join(points)
-                
-                refined_data.append(item)
-                logger.debug(f"Item {idx}/{len(data)} refinado")
-                
-            except Exception as e:
-                logger.error(f"Erro ao refinar item {idx}: {str(e)}")
-                refined_data.append(item)  # Mantém original
-        
-        logger.info(f"✅ Refinamento concluído: {len(refined_data)} itens processados")
-        return refined_data
+        instruction = _operation_instruction(operation)
+        if instruction is None:
+            logger.error(f"Operação inválida: {operation}")
+            return data
+        
+        logger.info(f"{len(uniq)} textos únicos para refinar")
+        
+        sem = asyncio.Semaphore(concurrency)
+        texts = list(uniq)
+        
+        # Cliente próprio do lote: o pool de conexões do AsyncOpenAI fica
+        # preso ao event loop, que termina junto com o lote
+        client = AsyncOpenAI(api_key=self.api_key)
+        try:
+            results = await asyncio.gather(
+                *(self._arefine_text(text, instruction, sem, client) for text in texts),
+                return_exceptions=True
+            )
+        finally:
+            await client.close()
+        
+        failures = []
+        
+        for text, result in zip(texts, results):
+            if isinstance(result, Exception):
+                failures.extend((idx + 1, result) for idx in uniq[text])
+                result = text  # Mantém o texto original em caso de erro
+            
+            for idx in uniq[text]:
+                _apply_result(data[idx], field, operation, result)
+        
+        if failures:
+            summary = ", ".join(f"{idx}: {str(e)}" for idx, e in failures[:10])
+            if len(failures) > 10:
+                summary += ", ..."
+            logger.error(f"Erro ao refinar {len(failures)}/{len(data)} itens: [{summary}]")
+        
+        logger.info(f"✅ Refinamento concluído: {len(data)} itens processados")
+        return data
+
+
+@lru_cache(maxsize=8)
+def _get_refiner(api_key: Optional[str], model: str, temperature: float) -> LLMRefiner:
+    """Instância compartilhada do refinador (reaproveita o cliente HTTP)"""
+    return LLMRefiner(api_key=api_key, model=model, temperature=temperature)
 
 
 def refine_data(
@@ -227,7 +634,7 @@ def refine_data(
         return data
     
     try:
-        refiner = LLMRefiner()
+        refiner = _get_refiner(os.getenv('OPENAI_API_KEY'), 'gpt-4o-mini', 0.3)
         return refiner.refine_batch(data, field=field, operation=operation)
     except Exception as e:
         logger.error(f"Erro no refinamento: {str(e)}")
@@ -5,16 +5,345 @@ Módulo principal de scraping usando Playwright.
 Coleta dados de páginas web de forma automatizada e robusta.
 """
 
+import asyncio
 import logging
-import time
-from typing import List, Dict, Optional
+from typing import Iterable, List, Dict, Optional
+from urllib.parse import urljoin
 from playwright.sync_api import sync_playwright, Browser, Page, BrowserContext
+from playwright.async_api import async_playwright
+from playwright.async_api import Browser as AsyncBrowser
+from playwright.async_api import BrowserContext as AsyncBrowserContext
+from playwright.async_api import Page as AsyncPage
 
-from .auto_detect import auto_detect_selectors
+from .auto_detect import (
+    auto_detect_selectors,
+    async_auto_detect_selectors,
+    template_for_url,
+    DEFAULT_SELECTORS,
+    FALLBACK_CONTAINERS,
+)
+from .browser_pool import BrowserPool, POOL
 
 logger = logging.getLogger(__name__)
 
 
+# Argumento do page.evaluate (Playwright serializa listas)
+_FALLBACK_CONTAINERS = list(FALLBACK_CONTAINERS)
+
+# Tipos de recurso que a extração não usa (ver block_resources)
+DEFAULT_BLOCKED_RESOURCES = frozenset({'image', 'font', 'media'})
+
+# Instalado em cada documento: memoiza querySelectorAll por seletor até a
+# próxima mutação do DOM (conteúdo carregado pelo scroll invalida o cache,
+# assim como mudanças de atributo, ex: class trocada numa re-renderização).
+# A auto-detecção e a extração consultam os mesmos seletores no mesmo DOM.
+_SELECTOR_CACHE_JS = """
+(() => {
+    const cache = new Map();
+    let observing = false;
+    window.__scraperQSA = (s) => {
+        if (!observing && document.documentElement) {
+            new MutationObserver(() => cache.clear())
+                .observe(document.documentElement, {childList: true, subtree: true, attributes: true});
+            observing = true;
+        }
+        let found = cache.get(s);
+        if (found === undefined) {
+            found = document.querySelectorAll(s);
+            if (observing) cache.set(s, found);
+        }
+        return found;
+    };
+})();
+"""
+
+# Extrai os campos de um container. Compartilhado por _EXTRACT_JS e
+# _EXTRACT_LOCATOR_JS. Os seletores de campo viram um único seletor união:
+# um querySelectorAll por container, e cada elemento encontrado é
+# classificado com Element.matches (o primeiro de cada campo vence, como
+# no querySelector). Seletores com :scope ficam fora da união: no matches
+# o :scope é o próprio elemento, não o container, então são consultados
+# um a um com querySelector. Seletores vazios ou inválidos ficam de fora.
+_ITEM_JS = """
+(() => {
+    const FIELDS = ['titleline', 'title', 'author', 'date', 'content', 'link'];
+    const probe = document.createDocumentFragment();
+    const valid = (s) => {
+        if (!s) return false;
+        try { probe.querySelector(s); return true; } catch (e) { return false; }
+    };
+    const text = (el) => (el.innerText ?? el.textContent ?? '').trim();
+    
+    return (sel) => {
+        const all = FIELDS
+            .map(f => [f, f === 'titleline' ? '.titleline > a' : sel[f]])
+            .filter(([f, s]) => valid(s));
+        const scoped = all.filter(([f, s]) => /:scope\b/i.test(s));
+        const fields = all.filter(([f, s]) => !/:scope\b/i.test(s));
+        const union = fields.map(([f, s]) => s).join(', ');
+        
+        return (c) => {
+            const found = {};
+            if (union) {
+                for (const el of c.querySelectorAll(union)) {
+                    for (const [f, s] of fields) {
+                        if (!found[f] && el.matches(s)) found[f] = el;
+                    }
+                }
+            }
+            for (const [f, s] of scoped) found[f] = c.querySelector(s);
+            
+            const item = {};
+            
+            // Título (.titleline > a tem prioridade) e o link dele.
+            // Links saem como no atributo href; o Python os torna absolutos.
+            const titleEl = found.titleline || found.title;
+            if (titleEl) {
+                item.title = text(titleEl);
+                const href = titleEl.getAttribute('href');
+                if (href) item.link = href;
+            }
+            
+            if (found.author) item.author = text(found.author);
+            
+            // Data: atributo datetime primeiro
+            if (found.date) item.date = found.date.getAttribute('datetime') || text(found.date);
+            
+            if (found.content) item.content = text(found.content);
+            
+            if (!('link' in item) && found.link) {
+                const href = found.link.getAttribute('href');
+                if (href) item.link = href;
+            }
+            
+            return item;
+        };
+    };
+})()
+"""
+
+# Extrai todos os containers e seus campos de uma vez, dentro do navegador.
+# `invalid` indica que o seletor de container não é CSS válido (ex: sintaxe
+# própria do Playwright como "text=" ou ">>"), caso de _EXTRACT_LOCATOR_JS.
+_EXTRACT_JS = """
+({sel, fallbacks, maxItems}) => {
+    const extractItem = (%s)(sel);
+    const qsa = window.__scraperQSA || ((s) => document.querySelectorAll(s));
+    const qa = (s) => {
+        if (!s) return [];
+        try { return Array.from(qsa(s)); } catch (e) { return null; }
+    };
+    
+    let selector = sel.container;
+    let containers = qa(selector);
+    const invalid = containers === null;
+    if (!containers || containers.length === 0) {
+        containers = [];
+        for (const s of fallbacks) {
+            const found = qa(s) || [];
+            if (found.length > 0) { containers = found; selector = s; break; }
+        }
+    }
+    
+    // Só os containers pedidos são processados e enviados ao Python
+    const wanted = maxItems ? containers.slice(0, maxItems) : containers;
+    const items = wanted.map(extractItem);
+    return {selector, total: containers.length, items, invalid};
+}
+""" % _ITEM_JS
+
+# Mesma extração para page.locator(container).evaluate_all, que entende
+# os seletores do Playwright
+_EXTRACT_LOCATOR_JS = """
+(containers, {sel, maxItems}) => ({
+    total: containers.length,
+    items: (maxItems ? containers.slice(0, maxItems) : containers).map((%s)(sel))
+})
+""" % _ITEM_JS
+
+
+# Scrolla até a altura da página (ou a contagem de stopSelector) estabilizar
+_SCROLL_JS = """
+async ({pause, maxScrolls, stopSelector}) => {
+    const count = () => {
+        try { return document.querySelectorAll(stopSelector).length; } catch (e) { return -1; }
+    };
+    let lastHeight = document.body.scrollHeight;
+    let lastCount = stopSelector ? count() : null;
+    let scrolls = 0;
+    
+    while (scrolls < maxScrolls) {
+        window.scrollTo(0, document.body.scrollHeight);
+        await new Promise(r => setTimeout(r, pause));
+        
+        const height = document.body.scrollHeight;
+        if (height === lastHeight) return {scrolls, height, reachedEnd: true};
+        
+        if (stopSelector) {
+            const n = count();
+            if (n === lastCount) return {scrolls, height, reachedEnd: true};
+            lastCount = n;
+        }
+        
+        lastHeight = height;
+        scrolls++;
+    }
+    return {scrolls, height: lastHeight, reachedEnd: false};
+}
+"""
+
+
+def _log_scroll(result: Dict, max_scrolls: int):
+    """Registra o resultado do _SCROLL_JS"""
+    if result['reachedEnd']:
+        logger.info(f"Fim da página alcançado após {result['scrolls']} scrolls")
+    else:
+        logger.warning(f"Limite de scrolls atingido ({max_scrolls})")
+    
+    logger.debug("Altura final: %spx", result['height'])
+
+
+def _block_handler(blocked: frozenset):
+    """
+    Cria o handler de page.route que aborta os tipos de recurso bloqueados.
+    
+    Args:
+        blocked: Tipos de recurso (request.resource_type) a abortar
+        
+    Returns:
+        Handler para page.route("**/*", ...)
+    """
+    def handler(route):
+        if route.request.resource_type in blocked:
+            return route.abort()
+        return route.continue_()
+    
+    return handler
+
+
+def _context_options(
+    viewport: Dict[str, int],
+    user_agent: Optional[str],
+    storage_state: Optional[str]
+) -> Dict:
+    """
+    Opções de browser.new_context() comuns aos dois scrapers.
+    
+    Args:
+        viewport: Dimensões da janela
+        user_agent: User-Agent customizado
+        storage_state: Caminho para arquivo JSON com cookies/auth
+        
+    Returns:
+        Opções para new_context() / launch_persistent_context()
+    """
+    context_options = {
+        "viewport": viewport,
+    }
+    
+    if user_agent:
+        context_options["user_agent"] = user_agent
+    
+    if storage_state:
+        logger.info(f"Carregando storage_state de: {storage_state}")
+        context_options["storage_state"] = storage_state
+    
+    return context_options
+
+
+def _scroll_args(pause_time: float, max_scrolls: int, stop_selector: Optional[str]) -> Dict:
+    """Argumento do _SCROLL_JS"""
+    return {"pause": pause_time * 1000, "maxScrolls": max_scrolls, "stopSelector": stop_selector}
+
+
+def _extract_args(selectors: Dict[str, str], max_items: Optional[int]) -> Dict:
+    """Argumento do _EXTRACT_JS"""
+    return {'sel': selectors, 'fallbacks': _FALLBACK_CONTAINERS, 'maxItems': max_items}
+
+
+def _with_detected(selectors: Dict[str, str], detected: Dict[str, str]) -> Dict[str, str]:
+    """Cópia dos seletores com os auto-detectados (não vazios) aplicados"""
+    merged = dict(selectors)
+    merged.update({k: v for k, v in detected.items() if v})
+    return merged
+
+
+def _wait_selector(url: str, selectors: Dict[str, str], auto_detect: bool) -> Optional[str]:
+    """
+    Seletor de container a esperar depois do goto.
+    
+    Só espera por seletores que devem existir na página: o container do
+    template do site ou um seletor configurado pelo usuário. O seletor
+    genérico padrão não casa na maioria dos sites e faria toda navegação
+    esperar o timeout inteiro.
+    
+    Args:
+        url: URL carregada (após redirecionamentos)
+        selectors: Seletores do scraper
+        auto_detect: Se True, considera o template do site
+        
+    Returns:
+        Seletor a esperar, ou None para seguir com o DOM atual
+    """
+    if auto_detect:
+        template = template_for_url(url)
+        if template and template.get('container'):
+            return template['container']
+    
+    if selectors['container'] != DEFAULT_SELECTORS['container']:
+        return selectors['container']
+    
+    return None
+
+
+def _locator_result(container_selector: str, found: Dict) -> Dict:
+    """Monta, a partir do _EXTRACT_LOCATOR_JS, um resultado no formato do _EXTRACT_JS"""
+    return {
+        'selector': container_selector,
+        'total': found['total'],
+        'items': found['items'],
+        'invalid': False
+    }
+
+
+def _collect_items(
+    result: Dict,
+    container_selector: str,
+    base_url: str
+) -> List[Dict[str, str]]:
+    """
+    Registra o resultado do _EXTRACT_JS, filtra os itens e converte
+    links relativos em absolutos. O limite max_items já vem aplicado
+    pelo navegador.
+    
+    Args:
+        result: Retorno do _EXTRACT_JS
+        container_selector: Seletor de container pedido
+        base_url: URL da página, base dos links relativos
+        
+    Returns:
+        Itens com pelo menos título ou link
+    """
+    if result['selector'] != container_selector:
+        logger.warning("⚠️ Nenhum container encontrado com seletores atuais")
+        logger.info(f"✅ Encontrados {result['total']} com {result['selector']}")
+    else:
+        logger.info(f"Encontrados {result['total']} containers na página")
+    
+    data = []
+    for item in result['items']:
+        # Só mantém itens com pelo menos título ou link
+        if not (item.get('title') or item.get('link')):
+            continue
+        
+        if item.get('link'):
+            item['link'] = urljoin(base_url, item['link'])
+        
+        data.append(item)
+    
+    return data
+
+
 class WebScraper:
     """
     Scraper web usando Playwright (modo síncrono).
@@ -28,14 +357,7 @@ class WebScraper:
     """
     
     # Seletores genéricos (fallback)
-    SELECTORS = {
-        'container': 'article, .post, .card, .item, .news-item, .athing, tr.athing',
-        'title': '.titleline > a, h1, h2, h3, .title, .headline',
-        'author': '.author, .byline, [rel="author"], .hnuser',
-        'date': 'time, .date, .published, .age',
-        'content': '.content, .description, .summary, p',
-        'link': 'a[href]',
-    }
+    SELECTORS = dict(DEFAULT_SELECTORS)
     
     def __init__(
         self,
@@ -44,7 +366,11 @@ class WebScraper:
         viewport: Dict[str, int] = None,
         user_agent: str = None,
         timeout: int = 30000,
-        auto_detect: bool = True
+        auto_detect: bool = True,
+        use_pool: bool = False,
+        block_resources: Optional[Iterable[str]] = None,
+        cdp_endpoint: Optional[str] = None,
+        persistent_profile: Optional[str] = None
     ):
         """
         Inicializa o scraper.
@@ -56,6 +382,16 @@ class WebScraper:
             user_agent: User-Agent customizado
             timeout: Timeout padrão em milissegundos
             auto_detect: Se True, tenta detectar seletores automaticamente
+            use_pool: Se True, reaproveita o navegador do POOL em vez de
+                iniciar um novo (o contexto é sempre novo). O navegador fica
+                aberto após close(); POOL.close() ou o fim do processo o fecha
+            block_resources: Tipos de recurso a não baixar
+                (ex: DEFAULT_BLOCKED_RESOURCES); None baixa tudo
+            cdp_endpoint: Endpoint CDP de um navegador já aberto
+                (ex: http://localhost:9222, ver shared_browser.py).
+                Conecta a ele em vez de iniciar um navegador; só chromium
+            persistent_profile: Diretório de perfil persistente. Cookies e
+                login ficam salvos nele entre execuções (dispensa storage_state)
         """
         self.headless = headless
         self.browser_type = browser_type
@@ -63,8 +399,16 @@ class WebScraper:
         self.user_agent = user_agent
         self.timeout = timeout
         self.auto_detect = auto_detect
+        self.use_pool = use_pool
+        self.block_resources = frozenset(block_resources or ())
+        self.cdp_endpoint = cdp_endpoint
+        self.persistent_profile = persistent_profile
+        
+        # Cópia por instância: seletores customizados não vazam para a classe
+        self.SELECTORS = dict(type(self).SELECTORS)
         
         self.playwright = None
+        self._base_url: Optional[str] = None
         self.browser: Optional[Browser] = None
         self.context: Optional[BrowserContext] = None
         self.page: Optional[Page] = None
@@ -85,56 +429,116 @@ class WebScraper:
         Args:
             storage_state: Caminho para arquivo JSON com cookies/auth
         """
-        logger.info(f"Iniciando navegador {self.browser_type} (headless={self.headless})")
-        
-        self.playwright = sync_playwright().start()
-        
-        # Seleciona o tipo de navegador
-        if self.browser_type == "chromium":
-            self.browser = self.playwright.chromium.launch(headless=self.headless)
-        elif self.browser_type == "firefox":
-            self.browser = self.playwright.firefox.launch(headless=self.headless)
-        elif self.browser_type == "webkit":
-            self.browser = self.playwright.webkit.launch(headless=self.headless)
-        else:
-            raise ValueError(f"Tipo de navegador inválido: {self.browser_type}")
+        # Libera recursos de um start() anterior
+        if self.context:
+            self.close()
         
         # Cria contexto do navegador (com ou sem storage_state)
-        context_options = {
-            "viewport": self.viewport,
-        }
+        context_options = _context_options(self.viewport, self.user_agent, storage_state)
         
-        if self.user_agent:
-            context_options["user_agent"] = self.user_agent
+        if self.persistent_profile:
+            if self.browser_type not in BrowserPool.BROWSER_TYPES:
+                raise ValueError(f"Tipo de navegador inválido: {self.browser_type}")
+            
+            if storage_state:
+                logger.warning("⚠️ storage_state ignorado: o perfil persistente já guarda a sessão")
+                context_options.pop("storage_state")
+            
+            logger.info(f"Abrindo perfil persistente: {self.persistent_profile}")
+            
+            # Sem objeto Browser: o contexto persistente é o próprio navegador
+            self.playwright = sync_playwright().start()
+            launcher = getattr(self.playwright, self.browser_type)
+            self.context = launcher.launch_persistent_context(
+                self.persistent_profile, headless=self.headless, **context_options
+            )
+            self.browser = None
+        elif self.use_pool:
+            self.context = POOL.acquire(
+                self.browser_type, self.headless, context_options, self.cdp_endpoint
+            )
+            self.browser = self.context.browser
+        elif self.cdp_endpoint:
+            logger.info(f"Conectando ao navegador compartilhado em {self.cdp_endpoint}")
+            
+            self.playwright = sync_playwright().start()
+            self.browser = self.playwright.chromium.connect_over_cdp(self.cdp_endpoint)
+            self.context = self.browser.new_context(**context_options)
+        else:
+            logger.info(f"Iniciando navegador {self.browser_type} (headless={self.headless})")
+            
+            self.playwright = sync_playwright().start()
             
-        if storage_state:
-            logger.info(f"Carregando storage_state de: {storage_state}")
-            context_options["storage_state"] = storage_state
+            # Seleciona o tipo de navegador
+            if self.browser_type == "chromium":
+                self.browser = self.playwright.chromium.launch(headless=self.headless)
+            elif self.browser_type == "firefox":
+                self.browser = self.playwright.firefox.launch(headless=self.headless)
+            elif self.browser_type == "webkit":
+                self.browser = self.playwright.webkit.launch(headless=self.headless)
+            else:
+                raise ValueError(f"Tipo de navegador inválido: {self.browser_type}")
+            
+            self.context = self.browser.new_context(**context_options)
         
-        self.context = self.browser.new_context(**context_options)
         self.context.set_default_timeout(self.timeout)
         
         # Cria nova página
         self.page = self.context.new_page()
+        self.page.add_init_script(_SELECTOR_CACHE_JS)
+        
+        # A rota fica na página (não no contexto) para não vazar ao POOL
+        if self.block_resources:
+            self.page.route("**/*", _block_handler(self.block_resources))
         logger.info("Navegador iniciado com sucesso")
         
-    def navigate(self, url: str, wait_until: str = "networkidle") -> bool:
+    def navigate(
+        self,
+        url: str,
+        wait_until: str = "domcontentloaded",
+        selector_timeout: int = 5000
+    ) -> bool:
         """
         Navega para uma URL.
         
+        Por padrão espera só o DOMContentLoaded e depois o primeiro container
+        aparecer no DOM, em vez de "networkidle" (500ms sem requisições), que
+        trava em sites com analytics/anúncios fazendo requisições contínuas.
+        O container só é esperado quando é conhecido (template do site ou
+        seletor customizado). Para páginas que montam o conteúdo bem depois
+        do DOM inicial, use wait_until="networkidle" ou aumente selector_timeout.
+        
         Args:
             url: URL de destino
             wait_until: Condição de espera (load, domcontentloaded, networkidle)
+            selector_timeout: Espera máxima pelo seletor de container (ms)
             
         Returns:
             True se navegação bem-sucedida, False caso contrário
         """
         logger.info(f"Navegando para: {url}")
         
+        # A base da página anterior não vale mais, mesmo se esta falhar
+        self._base_url = None
+        
         try:
             response = self.page.goto(url, wait_until=wait_until)
             
             if response and response.ok:
+                container = _wait_selector(self.page.url, self.SELECTORS, self.auto_detect)
+                if container:
+                    try:
+                        self.page.wait_for_selector(
+                            container,
+                            state='attached',
+                            timeout=min(selector_timeout, self.timeout)
+                        )
+                    except Exception:
+                        logger.debug("Container ainda não apareceu, seguindo com o DOM atual")
+                
+                # Base para os links relativos extraídos desta página
+                self._base_url = self.page.url
+                
                 logger.info(f"Página carregada: {self.page.title()} (status {response.status})")
                 return True
             else:
@@ -146,41 +550,35 @@ class WebScraper:
             logger.error(f"Erro ao navegar: {str(e)}")
             return False
     
-    def scroll_to_bottom(self, pause_time: float = 1.0, max_scrolls: int = 50):
+    def scroll_to_bottom(
+        self,
+        pause_time: float = 1.0,
+        max_scrolls: int = 50,
+        stop_selector: Optional[str] = None
+    ):
         """
         Scrolla até o final da página para carregar conteúdo dinâmico.
         
+        O loop inteiro roda dentro do navegador (uma única chamada).
+        
         Args:
             pause_time: Pausa entre scrolls (segundos)
             max_scrolls: Número máximo de tentativas de scroll
+            stop_selector: Se informado, para também quando a quantidade de
+                elementos com esse seletor (ex: containers) parar de crescer
         """
         logger.info("Iniciando scroll até o fim da página...")
         
-        last_height = self.page.evaluate("document.body.scrollHeight")
-        scrolls = 0
-        
-        while scrolls < max_scrolls:
-            # Scrolla até o fim
-            self.page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-            
-            # Aguarda carregamento
-            time.sleep(pause_time)
-            
-            # Calcula nova altura
-            new_height = self.page.evaluate("document.body.scrollHeight")
-            
-            # Se não mudou, chegamos ao fim
-            if new_height == last_height:
-                logger.info(f"Fim da página alcançado após {scrolls} scrolls")
-                break
-                
-            last_height = new_height
-            scrolls += 1
-            
-            logger.debug(f"Scroll {scrolls}/{max_scrolls} - Altura: {new_height}px")
+        try:
+            result = self.page.evaluate(
+                _SCROLL_JS,
+                _scroll_args(pause_time, max_scrolls, stop_selector)
+            )
+        except Exception as e:
+            logger.warning(f"Scroll interrompido: {str(e)}")
+            return
         
-        if scrolls >= max_scrolls:
-            logger.warning(f"Limite de scrolls atingido ({max_scrolls})")
+        _log_scroll(result, max_scrolls)
     
     def extract_data(self, max_items: Optional[int] = None) -> List[Dict[str, str]]:
         """
@@ -194,57 +592,43 @@ class WebScraper:
         """
         logger.info("Iniciando extração de dados...")
         
-        # Auto-detecção de seletores se habilitado
+        # Uma cópia por extração, enviada ao navegador e reusada abaixo
+        selectors = dict(self.SELECTORS)
+        
+        # Auto-detecção de seletores se habilitado (vale só para esta página)
         if self.auto_detect:
             try:
                 logger.info("🔍 Tentando auto-detectar seletores...")
                 detected_selectors = auto_detect_selectors(self.page)
-                
-                # Atualiza seletores com os detectados
-                for key, value in detected_selectors.items():
-                    if value:
-                        self.SELECTORS[key] = value
+                selectors = _with_detected(selectors, detected_selectors)
                 
                 logger.info("✅ Seletores auto-detectados aplicados")
             except Exception as e:
                 logger.warning(f"⚠️ Auto-detecção falhou, usando seletores padrão: {str(e)}")
         
+        container = selectors['container']
         data = []
         
         try:
-            # Busca todos os containers de conteúdo
-            containers = self.page.query_selector_all(self.SELECTORS['container'])
-            logger.info(f"Encontrados {len(containers)} containers na página")
-            
-            # Se não achou nada, tenta fallback
-            if len(containers) == 0:
-                logger.warning("⚠️ Nenhum container encontrado com seletores atuais")
-                logger.info("🔄 Tentando seletores alternativos...")
-                
-                # Tenta tags semânticas básicas
-                fallback_selectors = ['article', 'section', 'div[class*="post"]', 'div[class*="item"]']
-                for selector in fallback_selectors:
-                    containers = self.page.query_selector_all(selector)
-                    if len(containers) > 0:
-                        logger.info(f"✅ Encontrados {len(containers)} com {selector}")
-                        break
-            
-            # Limita quantidade se especificado
-            if max_items:
-                containers = containers[:max_items]
-            
-            for idx, container in enumerate(containers, 1):
+            # Containers e campos são extraídos numa única chamada ao navegador
+            result = self.page.evaluate(
+                _EXTRACT_JS,
+                _extract_args(selectors, max_items)
+            )
+            
+            # Seletor do Playwright (não CSS): resolve pelo locator
+            if result['invalid']:
                 try:
-                    item = self._extract_item_data(container)
-                    
-                    # Só adiciona se tiver pelo menos título ou link
-                    if item.get('title') or item.get('link'):
-                        data.append(item)
-                        logger.debug(f"Item {idx} extraído: {item.get('title', 'Sem título')[:50]}")
-                    
+                    found = self.page.locator(container).evaluate_all(
+                        _EXTRACT_LOCATOR_JS,
+                        {'sel': selectors, 'maxItems': max_items}
+                    )
+                    if found['total']:
+                        result = _locator_result(container, found)
                 except Exception as e:
-                    logger.warning(f"Erro ao extrair item {idx}: {str(e)}")
-                    continue
+                    logger.debug("Seletor de container inválido: %s", e)
+            
+            data = _collect_items(result, container, self._base_url or self.page.url)
             
             logger.info(f"Extração concluída: {len(data)} itens coletados")
             
@@ -253,63 +637,6 @@ class WebScraper:
         
         return data
     
-    def _extract_item_data(self, container) -> Dict[str, str]:
-        """
-        Extrai dados de um container específico.
-        
-        Args:
-            container: ElementHandle do container
-            
-        Returns:
-            Dicionário com os dados extraídos
-        """
-        item = {}
-        
-        # Extrai título (tenta .titleline > a primeiro, depois fallback para outros)
-        title_el = container.query_selector('.titleline > a')
-        if not title_el:
-            title_el = container.query_selector(self.SELECTORS['title'])
-        if title_el:
-            item['title'] = title_el.inner_text().strip()
-            # Pega o link do título também
-            href = title_el.get_attribute('href')
-            if href:
-                item['link'] = self.page.evaluate(
-                    f"new URL('{href}', window.location.href).href"
-                )
-        
-        # Extrai autor
-        author_el = container.query_selector(self.SELECTORS['author'])
-        if author_el:
-            item['author'] = author_el.inner_text().strip()
-        
-        # Extrai data
-        date_el = container.query_selector(self.SELECTORS['date'])
-        if date_el:
-            # Tenta pegar atributo datetime primeiro
-            date_value = date_el.get_attribute('datetime')
-            if not date_value:
-                date_value = date_el.inner_text().strip()
-            item['date'] = date_value
-        
-        # Extrai conteúdo/descrição
-        content_el = container.query_selector(self.SELECTORS['content'])
-        if content_el:
-            item['content'] = content_el.inner_text().strip()
-        
-        # Extrai link (apenas se ainda não tiver do título)
-        if 'link' not in item:
-            link_el = container.query_selector(self.SELECTORS['link'])
-            if link_el:
-                href = link_el.get_attribute('href')
-                if href:
-                    # Converte link relativo em absoluto
-                    item['link'] = self.page.evaluate(
-                        f"new URL('{href}', window.location.href).href"
-                    )
-        
-        return item
-    
     def screenshot(self, path: str = "screenshot.png"):
         """
         Captura screenshot da página atual.
@@ -329,12 +656,25 @@ class WebScraper:
         
         if self.page:
             self.page.close()
-        if self.context:
-            self.context.close()
-        if self.browser:
-            self.browser.close()
-        if self.playwright:
-            self.playwright.stop()
+        
+        if self.use_pool and not self.persistent_profile:
+            # Fecha só o contexto; o navegador continua no pool
+            if self.context:
+                POOL.release(self.context)
+        else:
+            if self.context:
+                self.context.close()
+            # O navegador compartilhado via CDP fica aberto para os outros
+            if self.browser and not self.cdp_endpoint:
+                self.browser.close()
+            if self.playwright:
+                self.playwright.stop()
+        
+        self.page = None
+        self.context = None
+        self.browser = None
+        self.playwright = None
+        self._base_url = None
             
         logger.info("Navegador fechado")
 
@@ -344,7 +684,9 @@ def scrape(
     headless: bool = False,
     storage_state: Optional[str] = None,
     scroll: bool = True,
-    max_items: Optional[int] = None
+    max_items: Optional[int] = None,
+    block_resources: Optional[Iterable[str]] = None,
+    cdp_endpoint: Optional[str] = None
 ) -> List[Dict[str, str]]:
     """
     Função helper para scraping simples.
@@ -355,11 +697,17 @@ def scrape(
         storage_state: Caminho para arquivo de autenticação
         scroll: Se True, scrolla até o fim da página
         max_items: Número máximo de itens
+        block_resources: Tipos de recurso a não baixar
+        cdp_endpoint: Endpoint CDP de um navegador compartilhado
         
     Returns:
         Lista de dicionários com dados coletados
     """
-    with WebScraper(headless=headless) as scraper:
+    with WebScraper(
+        headless=headless,
+        block_resources=block_resources,
+        cdp_endpoint=cdp_endpoint
+    ) as scraper:
         scraper.start(storage_state=storage_state)
         
         if not scraper.navigate(url):
@@ -369,3 +717,340 @@ def scrape(
             scraper.scroll_to_bottom()
         
         return scraper.extract_data(max_items=max_items)
+
+
+class AsyncWebScraper:
+    """
+    Scraper web usando Playwright (modo assíncrono).
+    
+    Mantém um único navegador e contexto, e abre uma página por URL,
+    permitindo coletar várias URLs em paralelo (ver scrape_many).
+    Os seletores auto-detectados valem só para a página em que foram
+    detectados.
+    """
+    
+    SELECTORS = dict(WebScraper.SELECTORS)
+    
+    def __init__(
+        self,
+        headless: bool = True,
+        browser_type: str = "chromium",
+        viewport: Dict[str, int] = None,
+        user_agent: str = None,
+        timeout: int = 30000,
+        auto_detect: bool = True,
+        block_resources: Optional[Iterable[str]] = None
+    ):
+        """
+        Inicializa o scraper.
+        
+        Args:
+            headless: Se True, executa sem interface gráfica
+            browser_type: Tipo do navegador (chromium, firefox, webkit)
+            viewport: Dimensões da janela {'width': 1920, 'height': 1080}
+            user_agent: User-Agent customizado
+            timeout: Timeout padrão em milissegundos
+            auto_detect: Se True, tenta detectar seletores automaticamente
+            block_resources: Tipos de recurso a não baixar
+                (ex: DEFAULT_BLOCKED_RESOURCES); None baixa tudo
+        """
+        self.headless = headless
+        self.browser_type = browser_type
+        self.viewport = viewport or {"width": 1920, "height": 1080}
+        self.user_agent = user_agent
+        self.timeout = timeout
+        self.auto_detect = auto_detect
+        self.block_resources = frozenset(block_resources or ())
+        
+        # Cópia por instância: seletores customizados não vazam para a classe
+        self.SELECTORS = dict(type(self).SELECTORS)
+        
+        self.playwright = None
+        self.browser: Optional[AsyncBrowser] = None
+        self.context: Optional[AsyncBrowserContext] = None
+    
+    async def __aenter__(self):
+        """Async context manager entry"""
+        await self.start()
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager exit"""
+        await self.close()
+    
+    async def start(self, storage_state: Optional[str] = None):
+        """
+        Inicia o navegador e o contexto compartilhado pelas páginas.
+        
+        Args:
+            storage_state: Caminho para arquivo JSON com cookies/auth
+        """
+        logger.info(f"Iniciando navegador {self.browser_type} (headless={self.headless}, async)")
+        
+        if self.browser_type not in BrowserPool.BROWSER_TYPES:
+            raise ValueError(f"Tipo de navegador inválido: {self.browser_type}")
+        
+        self.playwright = await async_playwright().start()
+        launcher = getattr(self.playwright, self.browser_type)
+        self.browser = await launcher.launch(headless=self.headless)
+        
+        context_options = _context_options(self.viewport, self.user_agent, storage_state)
+        self.context = await self.browser.new_context(**context_options)
+        self.context.set_default_timeout(self.timeout)
+        await self.context.add_init_script(_SELECTOR_CACHE_JS)
+        
+        if self.block_resources:
+            await self.context.route("**/*", _block_handler(self.block_resources))
+        
+        logger.info("Navegador iniciado com sucesso")
+    
+    async def scrape_url(
+        self,
+        url: str,
+        scroll: bool = True,
+        pause_time: float = 1.0,
+        max_items: Optional[int] = None,
+        wait_until: str = "domcontentloaded"
+    ) -> List[Dict[str, str]]:
+        """
+        Coleta uma URL numa página própria (fechada ao final).
+        
+        Args:
+            url: URL alvo
+            scroll: Se True, scrolla até o fim da página
+            pause_time: Pausa entre scrolls (segundos)
+            max_items: Número máximo de itens
+            wait_until: Condição de espera da navegação
+            
+        Returns:
+            Lista de dicionários com dados coletados
+        """
+        page = await self.context.new_page()
+        
+        try:
+            if not await self.navigate(page, url, wait_until=wait_until):
+                return []
+            
+            if scroll:
+                await self.scroll_to_bottom(page, pause_time=pause_time)
+            
+            return await self.extract_data(page, max_items=max_items)
+        finally:
+            await page.close()
+    
+    async def navigate(
+        self,
+        page: AsyncPage,
+        url: str,
+        wait_until: str = "domcontentloaded",
+        selector_timeout: int = 5000
+    ) -> bool:
+        """
+        Navega para uma URL (ver WebScraper.navigate).
+        
+        Args:
+            page: Página de destino
+            url: URL de destino
+            wait_until: Condição de espera (load, domcontentloaded, networkidle)
+            selector_timeout: Espera máxima pelo seletor de container (ms)
+            
+        Returns:
+            True se navegação bem-sucedida, False caso contrário
+        """
+        logger.info(f"Navegando para: {url}")
+        
+        try:
+            response = await page.goto(url, wait_until=wait_until)
+            
+            if response and response.ok:
+                container = _wait_selector(page.url, self.SELECTORS, self.auto_detect)
+                if container:
+                    try:
+                        await page.wait_for_selector(
+                            container,
+                            state='attached',
+                            timeout=min(selector_timeout, self.timeout)
+                        )
+                    except Exception:
+                        logger.debug("Container ainda não apareceu em %s, seguindo com o DOM atual", url)
+                
+                logger.info(f"Página carregada: {await page.title()} (status {response.status})")
+                return True
+            else:
+                status = response.status if response else "N/A"
+                logger.error(f"Falha ao carregar página (status {status})")
+                return False
+                
+        except Exception as e:
+            logger.error(f"Erro ao navegar: {str(e)}")
+            return False
+    
+    async def scroll_to_bottom(
+        self,
+        page: AsyncPage,
+        pause_time: float = 1.0,
+        max_scrolls: int = 50,
+        stop_selector: Optional[str] = None
+    ):
+        """
+        Scrolla até o final da página (ver WebScraper.scroll_to_bottom).
+        
+        Args:
+            page: Página a scrollar
+            pause_time: Pausa entre scrolls (segundos)
+            max_scrolls: Número máximo de tentativas de scroll
+            stop_selector: Se informado, para também quando a quantidade de
+                elementos com esse seletor parar de crescer
+        """
+        try:
+            result = await page.evaluate(
+                _SCROLL_JS,
+                _scroll_args(pause_time, max_scrolls, stop_selector)
+            )
+        except Exception as e:
+            logger.warning(f"Scroll interrompido em {page.url}: {str(e)}")
+            return
+        
+        _log_scroll(result, max_scrolls)
+    
+    async def extract_data(self, page: AsyncPage, max_items: Optional[int] = None) -> List[Dict[str, str]]:
+        """
+        Extrai dados da página usando seletores genéricos ou auto-detectados.
+        
+        Args:
+            page: Página de onde extrair
+            max_items: Número máximo de itens para extrair
+            
+        Returns:
+            Lista de dicionários com os dados coletados
+        """
+        selectors = dict(self.SELECTORS)
+        
+        if self.auto_detect:
+            try:
+                detected_selectors = await async_auto_detect_selectors(page)
+                selectors = _with_detected(selectors, detected_selectors)
+            except Exception as e:
+                logger.warning(f"⚠️ Auto-detecção falhou, usando seletores padrão: {str(e)}")
+        
+        container = selectors['container']
+        data = []
+        
+        try:
+            result = await page.evaluate(
+                _EXTRACT_JS,
+                _extract_args(selectors, max_items)
+            )
+            
+            # Seletor do Playwright (não CSS): resolve pelo locator
+            if result['invalid']:
+                try:
+                    found = await page.locator(container).evaluate_all(
+                        _EXTRACT_LOCATOR_JS,
+                        {'sel': selectors, 'maxItems': max_items}
+                    )
+                    if found['total']:
+                        result = _locator_result(container, found)
+                except Exception as e:
+                    logger.debug("Seletor de container inválido: %s", e)
+            
+            data = _collect_items(result, container, page.url)
+            
+            logger.info(f"Extração concluída: {len(data)} itens coletados de {page.url}")
+            
+        except Exception as e:
+            logger.error(f"Erro durante extração de dados: {str(e)}")
+        
+        return data
+    
+    async def close(self):
+        """Fecha o navegador e libera recursos (pode ser chamado de novo)"""
+        logger.info("Fechando navegador...")
+        
+        try:
+            if self.context:
+                await self.context.close()
+            if self.browser:
+                await self.browser.close()
+            if self.playwright:
+                await self.playwright.stop()
+        finally:
+            self.context = None
+            self.browser = None
+            self.playwright = None
+            
+        logger.info("Navegador fechado")
+
+
+async def scrape_many(
+    urls: List[str],
+    concurrency: int = 5,
+    headless: bool = True,
+    storage_state: Optional[str] = None,
+    scroll: bool = True,
+    pause_time: float = 1.0,
+    max_items: Optional[int] = None,
+    auto_detect: bool = True,
+    wait_until: str = "domcontentloaded",
+    wait_until_overrides: Optional[Dict[str, str]] = None,
+    block_resources: Optional[Iterable[str]] = None
+) -> List[List[Dict[str, str]]]:
+    """
+    Coleta várias URLs em paralelo num único navegador.
+    
+    Args:
+        urls: URLs alvo
+        concurrency: Número máximo de páginas abertas ao mesmo tempo
+        headless: Se True, executa sem interface
+        storage_state: Caminho para arquivo de autenticação
+        scroll: Se True, scrolla até o fim de cada página
+        pause_time: Pausa entre scrolls (segundos)
+        max_items: Número máximo de itens por URL
+        auto_detect: Se True, tenta detectar seletores automaticamente
+        wait_until: Condição de espera da navegação
+        wait_until_overrides: Condição de espera específica por URL
+        block_resources: Tipos de recurso a não baixar
+        
+    Returns:
+        Lista com os dados coletados de cada URL, na ordem de `urls`
+        (lista vazia para URLs que falharam)
+        
+    Raises:
+        ValueError: Se concurrency for menor que 1 (o semáforo nunca liberaria)
+    """
+    if concurrency < 1:
+        raise ValueError(f"concurrency deve ser pelo menos 1: {concurrency}")
+    
+    sem = asyncio.Semaphore(concurrency)
+    scraper = AsyncWebScraper(
+        headless=headless,
+        auto_detect=auto_detect,
+        block_resources=block_resources
+    )
+    
+    async def worker(url: str) -> List[Dict[str, str]]:
+        async with sem:
+            return await scraper.scrape_url(
+                url,
+                scroll=scroll,
+                pause_time=pause_time,
+                max_items=max_items,
+                wait_until=(wait_until_overrides or {}).get(url, wait_until)
+            )
+    
+    try:
+        # Dentro do try: se o start() falhar no meio, o que já abriu é fechado
+        await scraper.start(storage_state=storage_state)
+        results = await asyncio.gather(*(worker(url) for url in urls), return_exceptions=True)
+    finally:
+        await scraper.close()
+    
+    collected = []
+    for url, result in zip(urls, results):
+        if isinstance(result, Exception):
+            logger.error(f"Erro ao coletar {url}: {str(result)}")
+            collected.append([])
+        else:
+            collected.append(result)
+    
+    return collected
@@ -10,19 +10,77 @@ Módulo para salvar dados coletados em diferentes formatos:
 import csv
 import json
 import logging
+import queue
 import sqlite3
-from datetime import datetime
+import threading
+import time
+from datetime import datetime, timezone
+from itertools import chain
 from pathlib import Path
 from typing import List, Dict, Optional
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
 
+def _json_dumps(obj, indent: Optional[int] = 2) -> bytes:
+    """
+    Serializa para JSON em UTF-8 (orjson quando disponível).
+    
+    Args:
+        obj: Objeto a serializar
+        indent: Indentação (None para minificado)
+        
+    Returns:
+        JSON codificado em bytes
+    """
+    # orjson só suporta indentação de 2 espaços
+    if ORJSON_AVAILABLE and indent in (None, 2):
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=option)
+    
+    # Minificado: sem espaços após ',' e ':'
+    separators = (',', ':') if indent is None else None
+    return json.dumps(obj, ensure_ascii=False, indent=indent, separators=separators).encode('utf-8')
+
+
+def _json_loads(raw: bytes):
+    """Desserializa JSON (orjson quando disponível)"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
 class CSVStorage:
     """Gerencia salvamento de dados em formato CSV"""
     
-    @staticmethod
-    def save(data: List[Dict[str, str]], output_path: str, append: bool = False):
+    # Colunas padrão, na ordem em que aparecem no arquivo
+    FIELDS = ('title', 'author', 'date', 'link', 'content')
+    
+    @classmethod
+    def _columns(cls, data: List[Dict[str, str]]) -> List[str]:
+        """
+        Define as colunas: campos padrão primeiro, depois os extras
+        (ex: content_summary) na ordem em que aparecem.
+        
+        Args:
+            data: Lista de dicionários com os dados
+            
+        Returns:
+            Lista ordenada de colunas
+        """
+        keys = dict.fromkeys(chain.from_iterable(data))
+        return [k for k in cls.FIELDS if k in keys] + [k for k in keys if k not in cls.FIELDS]
+    
+    @classmethod
+    def save(cls, data: List[Dict[str, str]], output_path: str, append: bool = False):
         """
         Salva dados em arquivo CSV.
         
@@ -38,29 +96,70 @@ class CSVStorage:
         # Cria diretório se não existir
         Path(output_path).parent.mkdir(parents=True, exist_ok=True)
         
-        mode = 'a' if append else 'w'
+        path = Path(output_path)
+        header = None
         
         try:
-            # Pega todas as chaves únicas dos dados
-            fieldnames = set()
-            for item in data:
-                fieldnames.update(item.keys())
-            fieldnames = sorted(fieldnames)
+            # Ao adicionar, segue o cabeçalho já existente no arquivo
+            if append and path.exists():
+                with open(path, newline='', encoding='utf-8') as f:
+                    header = next(csv.reader(f), None)
+            
+            write_header = header is None
+            columns = header or cls._columns(data)
             
-            with open(output_path, mode, newline='', encoding='utf-8') as f:
-                writer = csv.DictWriter(f, fieldnames=fieldnames)
+            # Campos que o cabeçalho existente não tem: reescreve o arquivo
+            # com o cabeçalho ampliado em vez de descartá-los
+            if header is not None:
+                new_keys = [k for k in cls._columns(data) if k not in header]
+                if new_keys:
+                    logger.warning(
+                        f"⚠️ Novas colunas {new_keys}: reescrevendo {output_path} com o cabeçalho ampliado"
+                    )
+                    columns = header + new_keys
+                    cls._widen_header(path, columns)
+            
+            with open(path, 'a' if append else 'w', newline='', encoding='utf-8') as f:
+                writer = csv.writer(f)
                 
                 # Escreve cabeçalho se for novo arquivo
-                if mode == 'w':
-                    writer.writeheader()
+                if write_header:
+                    writer.writerow(columns)
                 
-                writer.writerows(data)
+                writer.writerows(
+                    tuple(item.get(k, '') for k in columns) for item in data
+                )
             
             logger.info(f"✅ {len(data)} itens salvos em: {output_path}")
             
         except Exception as e:
             logger.error(f"❌ Erro ao salvar CSV: {str(e)}")
             raise
+    
+    @staticmethod
+    def _widen_header(path: Path, columns: List[str]):
+        """
+        Reescreve o CSV com um cabeçalho maior; as linhas existentes
+        ficam com as colunas novas vazias.
+        
+        Args:
+            path: Arquivo CSV existente
+            columns: Novo cabeçalho (o antigo seguido das colunas novas)
+        """
+        tmp_path = path.with_name(path.name + '.tmp')
+        
+        with open(path, newline='', encoding='utf-8') as src, \
+                open(tmp_path, 'w', newline='', encoding='utf-8') as dst:
+            reader = csv.reader(src)
+            writer = csv.writer(dst)
+            
+            next(reader, None)
+            writer.writerow(columns)
+            
+            padding = [''] * len(columns)
+            writer.writerows(row + padding[len(row):] for row in reader)
+        
+        tmp_path.replace(path)
 
 
 class SQLiteStorage:
@@ -79,6 +178,13 @@ class SQLiteStorage:
         Path(db_path).parent.mkdir(parents=True, exist_ok=True)
         
         self.conn = sqlite3.connect(db_path)
+        self.conn.executescript("""
+            PRAGMA journal_mode=WAL;
+            PRAGMA synchronous=NORMAL;
+            PRAGMA temp_store=MEMORY;
+            PRAGMA mmap_size=268435456;
+            PRAGMA cache_size=-65536;
+        """)
         self.cursor = self.conn.cursor()
         
         self._create_table()
@@ -110,41 +216,80 @@ class SQLiteStorage:
             logger.warning("Nenhum dado para salvar")
             return
         
-        inserted = 0
-        duplicates = 0
-        errors = 0
+        rows = self._to_rows(self._dedupe(data))
+        inserted = self._insert(rows)
+        duplicates = len(data) - inserted
+        
+        logger.info(
+            f"✅ Banco atualizado: {inserted} novos | "
+            f"{duplicates} duplicados"
+        )
+    
+    @staticmethod
+    def _dedupe(data: List[Dict[str, str]]) -> List[Dict[str, str]]:
+        """
+        Remove itens com link repetido no próprio lote (mantém o primeiro,
+        como o INSERT OR IGNORE faria). Itens sem link são mantidos.
         
+        Args:
+            data: Lista de dicionários com os dados
+            
+        Returns:
+            Lista sem links repetidos
+        """
+        seen = set()
+        unique = []
         for item in data:
-            try:
-                self.cursor.execute("""
+            link = item.get('link')
+            if link:
+                if link in seen:
+                    continue
+                seen.add(link)
+            unique.append(item)
+        
+        if len(unique) < len(data):
+            logger.debug("Links repetidos no lote: %d -> %d itens", len(data), len(unique))
+        
+        return unique
+    
+    @staticmethod
+    def _to_rows(data: List[Dict[str, str]]) -> List[tuple]:
+        """Converte os itens em tuplas na ordem das colunas do INSERT"""
+        return [
+            (
+                item.get('title'),
+                item.get('author'),
+                item.get('date'),
+                item.get('link'),
+                item.get('content')
+            )
+            for item in data
+        ]
+    
+    def _insert(self, rows: List[tuple]) -> int:
+        """
+        Insere as linhas numa única transação.
+        
+        Args:
+            rows: Tuplas geradas por _to_rows
+            
+        Returns:
+            Número de linhas novas (links repetidos são ignorados)
+        """
+        try:
+            # Uma transação e um único statement preparado para todo o lote;
+            # INSERT OR IGNORE descarta links repetidos (UNIQUE)
+            with self.conn:
+                cursor = self.conn.executemany("""
                     INSERT OR IGNORE INTO scraped_data 
                     (title, author, date, link, content)
                     VALUES (?, ?, ?, ?, ?)
-                """, (
-                    item.get('title'),
-                    item.get('author'),
-                    item.get('date'),
-                    item.get('link'),
-                    item.get('content')
-                ))
-                
-                if self.cursor.rowcount > 0:
-                    inserted += 1
-                else:
-                    duplicates += 1
-                    
-            except sqlite3.IntegrityError:
-                duplicates += 1
-            except Exception as e:
-                logger.warning(f"Erro ao inserir item: {str(e)}")
-                errors += 1
-        
-        self.conn.commit()
+                """, rows)
+        except sqlite3.Error as e:
+            logger.error(f"❌ Erro ao salvar no banco: {str(e)}")
+            raise
         
-        logger.info(
-            f"✅ Banco atualizado: {inserted} novos | "
-            f"{duplicates} duplicados | {errors} erros"
-        )
+        return cursor.rowcount
     
     def get_all(self, limit: Optional[int] = None) -> List[Dict[str, str]]:
         """
@@ -175,6 +320,12 @@ class SQLiteStorage:
     
     def close(self):
         """Fecha conexão com banco"""
+        # Atualiza as estatísticas do planejador de consultas, se preciso
+        try:
+            self.conn.execute("PRAGMA optimize")
+        except sqlite3.Error as e:
+            logger.debug("PRAGMA optimize falhou: %s", e)
+        
         self.conn.close()
         logger.info(f"Conexão com banco fechada: {self.db_path}")
     
@@ -185,11 +336,169 @@ class SQLiteStorage:
         self.close()
 
 
+class AsyncSQLiteStorage:
+    """
+    Salva no SQLite numa thread própria, sem bloquear quem coleta.
+    
+    save() só enfileira o lote; a thread de escrita junta os lotes que
+    chegarem (até `batch_size` linhas ou `flush_interval` segundos) e os
+    grava numa única transação. Use flush() para esperar a gravação e
+    close() para encerrar a thread.
+    """
+    
+    _STOP = object()
+    
+    def __init__(self, db_path: str, batch_size: int = 500, flush_interval: float = 0.2):
+        """
+        Inicia a thread de escrita.
+        
+        Args:
+            db_path: Caminho do arquivo SQLite
+            batch_size: Máximo de linhas por transação
+            flush_interval: Tempo máximo (segundos) esperando mais lotes
+        """
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        
+        self.inserted = 0
+        self.duplicates = 0
+        self._skipped = 0
+        self.error: Optional[Exception] = None
+        
+        self._queue: queue.Queue = queue.Queue()
+        self._ready = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name=f"sqlite-writer:{db_path}", daemon=True
+        )
+        self._thread.start()
+        
+        # Propaga erros de abertura do banco para quem criou o storage
+        self._ready.wait()
+        if self.error:
+            raise self.error
+    
+    def save(self, data: List[Dict[str, str]]):
+        """
+        Enfileira dados para gravação.
+        
+        Args:
+            data: Lista de dicionários com os dados
+        """
+        if not data:
+            logger.warning("Nenhum dado para salvar")
+            return
+        
+        if not self._thread.is_alive():
+            raise RuntimeError(f"AsyncSQLiteStorage já fechado: {self.db_path}")
+        
+        # Repetidos no lote nem chegam à fila (contados à parte da
+        # thread de escrita, que atualiza self.duplicates)
+        unique = SQLiteStorage._dedupe(data)
+        self._skipped += len(data) - len(unique)
+        self._queue.put(SQLiteStorage._to_rows(unique))
+    
+    def flush(self):
+        """
+        Espera a gravação de todos os lotes enfileirados.
+        
+        Raises:
+            Exception: Erro de gravação ocorrido na thread de escrita
+        """
+        self._queue.join()
+        self._raise_error()
+    
+    def close(self):
+        """Grava o que falta, encerra a thread e fecha a conexão"""
+        if self._thread.is_alive():
+            self._queue.put(self._STOP)
+            self._thread.join()
+        
+        logger.info(
+            f"✅ Banco atualizado: {self.inserted} novos | "
+            f"{self.duplicates + self._skipped} duplicados"
+        )
+        
+        self._raise_error()
+    
+    def _raise_error(self):
+        """Repassa (uma vez) o erro guardado pela thread de escrita"""
+        error, self.error = self.error, None
+        if error:
+            raise error
+    
+    def _run(self):
+        """Loop da thread de escrita"""
+        try:
+            db = SQLiteStorage(self.db_path)
+        except Exception as e:
+            self.error = e
+            return
+        finally:
+            self._ready.set()
+        
+        try:
+            stop = False
+            while not stop:
+                rows = self._queue.get()
+                taken = 1
+                
+                try:
+                    if rows is self._STOP:
+                        break
+                    
+                    # Junta os lotes que chegarem logo em seguida
+                    rows = list(rows)
+                    deadline = time.monotonic() + self.flush_interval
+                    while len(rows) < self.batch_size:
+                        timeout = deadline - time.monotonic()
+                        if timeout <= 0:
+                            break
+                        try:
+                            more = self._queue.get(timeout=timeout)
+                        except queue.Empty:
+                            break
+                        taken += 1
+                        if more is self._STOP:
+                            stop = True
+                            break
+                        rows.extend(more)
+                    
+                    inserted = db._insert(rows)
+                    self.inserted += inserted
+                    self.duplicates += len(rows) - inserted
+                except Exception as e:
+                    # A thread segue drenando a fila (flush/close não travam);
+                    # o erro é repassado por flush() ou close()
+                    logger.error(f"❌ Erro na thread de escrita: {str(e)}")
+                    self.error = e
+                finally:
+                    for _ in range(taken):
+                        self._queue.task_done()
+        finally:
+            db.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
 class JSONStorage:
     """Gerencia salvamento de dados em formato JSON"""
     
+    # Extensões tratadas como JSON Lines (um item por linha)
+    LINES_SUFFIXES = ('.jsonl', '.ndjson')
+    
     @staticmethod
-    def save(data: List[Dict[str, str]], output_path: str, indent: int = 2):
+    def save(
+        data: List[Dict[str, str]],
+        output_path: str,
+        indent: Optional[int] = 2,
+        lines: bool = False,
+        append: bool = False
+    ):
         """
         Salva dados em arquivo JSON.
         
@@ -197,6 +506,8 @@ class JSONStorage:
             data: Lista de dicionários com os dados
             output_path: Caminho do arquivo de saída
             indent: Indentação do JSON (None para minificado)
+            lines: Se True, grava JSON Lines (um item por linha, sem metadata)
+            append: Se True, adiciona ao arquivo existente (só com lines)
         """
         if not data:
             logger.warning("Nenhum dado para salvar")
@@ -206,15 +517,19 @@ class JSONStorage:
         Path(output_path).parent.mkdir(parents=True, exist_ok=True)
         
         try:
-            # Adiciona metadata
-            output = {
-                "scraped_at": datetime.now().isoformat(),
-                "total_items": len(data),
-                "data": data
-            }
-            
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(output, f, ensure_ascii=False, indent=indent)
+            if lines:
+                with open(output_path, 'ab' if append else 'wb') as f:
+                    f.writelines(_json_dumps(item, None) + b'\n' for item in data)
+            else:
+                # Adiciona metadata
+                output = {
+                    "scraped_at": datetime.now(timezone.utc).isoformat(timespec='seconds'),
+                    "total_items": len(data),
+                    "data": data
+                }
+                
+                with open(output_path, 'wb') as f:
+                    f.write(_json_dumps(output, indent))
             
             logger.info(f"✅ {len(data)} itens salvos em: {output_path}")
             
@@ -234,8 +549,10 @@ class JSONStorage:
             Lista de dicionários com os dados
         """
         try:
-            with open(input_path, 'r', encoding='utf-8') as f:
-                content = json.load(f)
+            with open(input_path, 'rb') as f:
+                if input_path.endswith(JSONStorage.LINES_SUFFIXES):
+                    return [_json_loads(line) for line in f if line.strip()]
+                content = _json_loads(f.read())
             
             # Se tiver estrutura com metadata, retorna só os dados
             if isinstance(content, dict) and 'data' in content:
@@ -261,7 +578,7 @@ def save_data(
         data: Lista de dicionários com os dados
         output_path: Caminho do arquivo CSV/JSON
         database_path: Caminho do banco SQLite
-        format: Formato do arquivo ('csv' ou 'json')
+        format: Formato do arquivo ('csv', 'json' ou 'jsonl')
     """
     if not data:
         logger.warning("Nenhum dado para salvar")
@@ -273,6 +590,8 @@ def save_data(
             CSVStorage.save(data, output_path)
         elif format == 'json':
             JSONStorage.save(data, output_path)
+        elif format == 'jsonl':
+            JSONStorage.save(data, output_path, lines=True)
         else:
             logger.error(f"Formato inválido: {format}")
     
@@ -0,0 +1,29 @@
+"""
+Utilitários
+
+Funções pequenas compartilhadas pelos scripts (main.py, app.py,
+save_storage.py), sem dependências externas.
+"""
+
+from urllib.parse import urlsplit
+
+
+def validate_url(url: str) -> bool:
+    """
+    Verifica se a URL é http(s) e tem domínio.
+    
+    Rejeita casos que um startswith('http') aceitaria, como
+    "httpfoo://site" ou "http://".
+    
+    Args:
+        url: URL a validar
+        
+    Returns:
+        True se o esquema for http/https e houver domínio
+    """
+    try:
+        parts = urlsplit(url)
+    except ValueError:
+        return False
+    
+    return parts.scheme in ('http', 'https') and bool(parts.netloc)
@@ -8,13 +8,35 @@ Uso:
 """
 
 import streamlit as st
-import pandas as pd
 from pathlib import Path
 from datetime import datetime
+import importlib.util
+import io
 import json
+import os
+from typing import TYPE_CHECKING
 
-from agent.scraper import WebScraper
+# pandas (~200 ms para importar) só é carregado quando um DataFrame é
+# realmente necessário: após um scraping ou ao abrir um arquivo do histórico
+if TYPE_CHECKING:
+    import pandas as pd
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+from agent.browser_pool import BrowserThread
+from agent.scraper import WebScraper, DEFAULT_BLOCKED_RESOURCES
 from agent.storage import save_data
+from agent.util import validate_url
+
+# Usado pelo pandas (engine="pyarrow"); só verifica, sem importar
+PYARROW_AVAILABLE = importlib.util.find_spec("pyarrow") is not None
+
+# Linhas exibidas no preview do histórico (o arquivo inteiro vai no download)
+PREVIEW_ROWS = 1000
 
 # Configuração da página
 st.set_page_config(
@@ -24,8 +46,90 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# CSS customizado
-st.markdown("""
+
+@st.cache_resource
+def get_browser_worker() -> BrowserThread:
+    """
+    Thread única, compartilhada entre reruns, onde roda todo o Playwright.
+    
+    Objetos da API síncrona do Playwright só funcionam na thread que os
+    criou, e cada rerun do Streamlit roda numa thread nova. Executando
+    tudo nesta thread, o navegador do POOL continua aberto entre cliques,
+    e é ela mesma que o fecha quando o processo termina.
+    
+    A thread é do processo, não da sessão: scrapes de sessões diferentes
+    rodam um de cada vez, na ordem em que chegam.
+    """
+    return BrowserThread()
+
+
+def in_browser_thread(fn, *args, **kwargs):
+    """Executa fn na thread do navegador e espera o resultado"""
+    return get_browser_worker().submit(fn, *args, **kwargs).result()
+
+
+@st.cache_data(ttl=30)
+def list_history(data_dir: str) -> list:
+    """
+    Lista os CSVs de scraping, do mais recente ao mais antigo.
+    
+    Args:
+        data_dir: Pasta dos arquivos
+        
+    Returns:
+        Lista de (nome, tamanho em bytes, mtime)
+    """
+    history = []
+    
+    # DirEntry.stat() reaproveita a leitura do diretório (sem um stat por arquivo)
+    with os.scandir(data_dir) as entries:
+        for entry in entries:
+            if entry.name.startswith("scraping_") and entry.name.endswith(".csv"):
+                stat = entry.stat()
+                history.append((entry.name, stat.st_size, stat.st_mtime))
+    
+    history.sort(key=lambda item: item[2], reverse=True)
+    return history
+
+
+def _pd():
+    """Módulo pandas, importado só na primeira chamada"""
+    import pandas
+    return pandas
+
+
+@st.cache_data
+def load_csv(path: str, mtime: float) -> "pd.DataFrame":
+    """Lê um CSV do histórico (mtime invalida o cache quando o arquivo muda)"""
+    if PYARROW_AVAILABLE:
+        return _pd().read_csv(path, engine="pyarrow", dtype_backend="pyarrow")
+    return _pd().read_csv(path)
+
+
+@st.cache_data
+def read_bytes(path: str, mtime: float) -> bytes:
+    """Conteúdo bruto de um arquivo do histórico, para download"""
+    return Path(path).read_bytes()
+
+
+def csv_bytes(df: "pd.DataFrame") -> bytes:
+    """Codifica o DataFrame como CSV direto em bytes"""
+    buf = io.BytesIO()
+    df.to_csv(buf, index=False, encoding='utf-8')
+    return buf.getvalue()
+
+
+def json_bytes(data: list) -> bytes:
+    """Codifica os dados como JSON indentado em bytes (orjson quando disponível)"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8')
+
+
+@st.cache_resource
+def page_header() -> str:
+    """CSS customizado + header, montados uma vez por processo e enviados num único elemento"""
+    return """
 <style>
     .main-header {
         font-size: 3rem;
@@ -48,10 +152,12 @@ st.markdown("""
         margin: 1rem 0;
     }
 </style>
-""", unsafe_allow_html=True)
 
-# Header
-st.markdown('<div class="main-header">🕷️ Web Scraper</div>', unsafe_allow_html=True)
+<div class="main-header">🕷️ Web Scraper</div>
+"""
+
+
+st.markdown(page_header(), unsafe_allow_html=True)
 st.markdown("---")
 
 # Sidebar - Configurações
@@ -89,6 +195,7 @@ headless = st.sidebar.checkbox("🔇 Headless mode", value=True, help="Executar
 no_scroll = st.sidebar.checkbox("🚫 Não fazer scroll", value=False)
 use_storage = st.sidebar.checkbox("🔐 Usar autenticação (storage_state.json)", value=False)
 auto_detect = st.sidebar.checkbox("🤖 Auto-detectar seletores", value=True, help="Detecta automaticamente seletores CSS para o site")
+block_resources = st.sidebar.checkbox("🖼️ Bloquear imagens/fontes/mídia", value=False, help="Não baixa recursos que a extração não usa (carrega mais rápido)")
 
 # Output
 st.sidebar.markdown("---")
@@ -100,9 +207,13 @@ output_format = st.sidebar.selectbox(
     help="Formato do arquivo de saída"
 )
 
+# Timestamp do nome padrão fixo entre reruns (renovado a cada scraping),
+# para o valor padrão do campo não mudar a cada interação
+st.session_state.setdefault("run_ts", datetime.now().strftime('%Y%m%d_%H%M%S'))
+
 output_path = st.sidebar.text_input(
     "Caminho do arquivo",
-    value=f"data/scraping_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{output_format}"
+    value=f"data/scraping_{st.session_state['run_ts']}.{output_format}"
 )
 
 save_to_db = st.sidebar.checkbox("💿 Salvar em SQLite", value=False)
@@ -145,6 +256,11 @@ with st.sidebar.expander("🎯 Seletores CSS (Avançado)"):
         help="Seletor para conteúdo"
     )
 
+# Resultado do último scraping, mantido entre reruns
+st.session_state.setdefault("last_data", None)
+st.session_state.setdefault("last_df", None)
+st.session_state.setdefault("last_output", None)
+
 # Main content
 tab1, tab2, tab3 = st.tabs(["🚀 Executar", "📊 Histórico", "ℹ️ Ajuda"])
 
@@ -158,6 +274,7 @@ with tab1:
             "Max items": max_items,
             "Headless": "Sim" if headless else "Não",
             "Auto-detect": "Sim" if auto_detect else "Não",
+            "Bloquear recursos": "Sim" if block_resources else "Não",
             "Scroll": "Não" if no_scroll else f"Sim (pausa: {scroll_pause}s)",
             "Output": output_path,
             "Formato": output_format.upper(),
@@ -184,74 +301,65 @@ with tab1:
     # Execução
     if execute_button and url:
         # Validação básica
-        if not url.startswith('http'):
-            st.error("❌ URL inválida. Deve começar com http:// ou https://")
+        if not validate_url(url):
+            st.error("❌ URL inválida. Deve começar com http:// ou https:// e ter um domínio")
         else:
-            # Container para logs e resultados
-            status_container = st.empty()
-            progress_bar = st.progress(0)
-            log_container = st.expander("📝 Logs", expanded=True)
+            # Um único container de status, atualizado a cada etapa
+            status = st.status("🚀 Iniciando scraping...", expanded=False)
+            
+            # Descarta o resultado anterior (não deve aparecer se este falhar)
+            st.session_state["last_data"] = st.session_state["last_df"] = None
             
             try:
-                with status_container.container():
-                    st.info("🚀 Iniciando scraping...")
-                
-                progress_bar.progress(10)
-                
                 # Inicializa scraper
-                with log_container:
-                    st.text("🌐 Iniciando navegador...")
+                status.update(label="🌐 Iniciando navegador...")
                 
-                scraper = WebScraper(headless=headless, auto_detect=auto_detect)
+                # Navegador reaproveitado do POOL (ver get_browser_worker)
+                scraper = WebScraper(
+                    headless=headless,
+                    use_pool=True,
+                    auto_detect=auto_detect,
+                    block_resources=DEFAULT_BLOCKED_RESOURCES if block_resources else None
+                )
                 
                 # Aplica seletores customizados se fornecidos (desabilita auto-detect neste caso)
                 if any(custom_selectors.values()):
                     scraper.auto_detect = False
-                    for key, value in custom_selectors.items():
-                        if value:
-                            scraper.SELECTORS[key] = value
-                    st.text("✅ Seletores customizados aplicados")
+                    scraper.SELECTORS.update({k: v for k, v in custom_selectors.items() if v})
+                    status.write("✅ Seletores customizados aplicados")
                 
                 storage_state = "storage_state.json" if use_storage and Path("storage_state.json").exists() else None
-                scraper.start(storage_state=storage_state)
-                
-                progress_bar.progress(30)
-                
-                with log_container:
-                    st.text(f"📡 Navegando para: {url}")
-                
-                # Navega
-                if not scraper.navigate(url):
-                    st.error("❌ Falha ao carregar página")
-                    scraper.close()
-                    st.stop()
-                
-                progress_bar.progress(50)
-                
-                # Scroll
-                if not no_scroll:
-                    with log_container:
-                        st.text("📜 Fazendo scroll...")
-                    scraper.scroll_to_bottom(pause_time=scroll_pause)
-                
-                progress_bar.progress(70)
-                
-                # Extrai dados
-                with log_container:
-                    st.text("🔍 Extraindo dados...")
                 
-                data = scraper.extract_data(max_items=max_items)
-                scraper.close()
-                
-                progress_bar.progress(90)
+                try:
+                    in_browser_thread(scraper.start, storage_state=storage_state)
+                    
+                    # Navega
+                    status.update(label=f"📡 Navegando para: {url}")
+                    
+                    if not in_browser_thread(scraper.navigate, url):
+                        status.update(label="❌ Falha ao carregar página", state="error")
+                        st.stop()
+                    
+                    # Scroll
+                    if not no_scroll:
+                        status.update(label="📜 Fazendo scroll...")
+                        in_browser_thread(scraper.scroll_to_bottom, pause_time=scroll_pause)
+                    
+                    # Extrai dados
+                    status.update(label="🔍 Extraindo dados...")
+                    
+                    data = in_browser_thread(scraper.extract_data, max_items=max_items)
+                finally:
+                    # Libera o contexto mesmo com erro ou st.stop()
+                    in_browser_thread(scraper.close)
                 
                 if not data:
+                    status.update(label="⚠️ Nenhum dado coletado", state="error")
                     st.warning("⚠️ Nenhum dado coletado. Verifique os seletores CSS.")
                     st.stop()
                 
                 # Salva dados
-                with log_container:
-                    st.text("💾 Salvando dados...")
+                status.update(label="💾 Salvando dados...")
                 
                 save_data(
                     data=data,
@@ -260,55 +368,29 @@ with tab1:
                     format=output_format
                 )
                 
-                progress_bar.progress(100)
-                
-                # Sucesso!
-                status_container.empty()
-                st.markdown(f"""
-                <div class="success-box">
-                    <h3>✅ Scraping concluído com sucesso!</h3>
-                    <p><strong>Total de itens:</strong> {len(data)}</p>
-                    <p><strong>Arquivo:</strong> {output_path}</p>
-                    {f'<p><strong>Banco:</strong> {db_path}</p>' if db_path else ''}
-                </div>
-                """, unsafe_allow_html=True)
-                
-                # Preview dos dados
-                st.subheader("📊 Preview dos Dados")
-                df = pd.DataFrame(data)
-                st.dataframe(df, use_container_width=True)
+                # O novo arquivo aparece no histórico sem esperar o TTL
+                list_history.clear()
                 
-                # Estatísticas
-                col1, col2, col3 = st.columns(3)
-                with col1:
-                    st.metric("Total de itens", len(data))
-                with col2:
-                    st.metric("Colunas", len(df.columns))
-                with col3:
-                    st.metric("Tamanho", f"{len(str(data)) / 1024:.1f} KB")
+                # Próximo scraping ganha um nome de arquivo novo
+                st.session_state["run_ts"] = datetime.now().strftime('%Y%m%d_%H%M%S')
                 
-                # Download
-                st.subheader("📥 Download")
+                # Sucesso! O resultado fica na sessão e é exibido abaixo,
+                # inclusive nos reruns seguintes (ex: clique no download)
+                status.update(label=f"✅ {len(data)} itens coletados", state="complete")
                 
-                if output_format == "csv":
-                    csv_data = df.to_csv(index=False)
-                    st.download_button(
-                        "⬇️ Download CSV",
-                        csv_data,
-                        file_name=Path(output_path).name,
-                        mime="text/csv"
-                    )
-                else:
-                    json_data = json.dumps(data, ensure_ascii=False, indent=2)
-                    st.download_button(
-                        "⬇️ Download JSON",
-                        json_data,
-                        file_name=Path(output_path).name,
-                        mime="application/json"
-                    )
+                # Campos coletados são sempre texto: dispensa a inferência de tipos
+                df = _pd().DataFrame(data, dtype="string")
+                st.session_state["last_data"] = data
+                st.session_state["last_df"] = df
+                st.session_state["last_output"] = {
+                    "path": output_path,
+                    "format": output_format,
+                    "db": db_path,
+                    "download": csv_bytes(df) if output_format == "csv" else json_bytes(data)
+                }
                 
             except Exception as e:
-                status_container.empty()
+                status.update(label="❌ Erro durante scraping", state="error")
                 st.markdown(f"""
                 <div class="error-box">
                     <h3>❌ Erro durante scraping</h3>
@@ -318,6 +400,53 @@ with tab1:
                 
                 with st.expander("🔍 Detalhes do erro"):
                     st.exception(e)
+    
+    # Resultado do último scraping desta sessão
+    if st.session_state["last_df"] is not None:
+        data = st.session_state["last_data"]
+        df = st.session_state["last_df"]
+        last_output = st.session_state["last_output"]
+        
+        st.markdown(f"""
+        <div class="success-box">
+            <h3>✅ Scraping concluído com sucesso!</h3>
+            <p><strong>Total de itens:</strong> {len(data)}</p>
+            <p><strong>Arquivo:</strong> {last_output["path"]}</p>
+            {f'<p><strong>Banco:</strong> {last_output["db"]}</p>' if last_output["db"] else ''}
+        </div>
+        """, unsafe_allow_html=True)
+        
+        # Preview dos dados
+        st.subheader("📊 Preview dos Dados")
+        st.dataframe(df, use_container_width=True)
+        
+        # Estatísticas
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Total de itens", len(data))
+        with col2:
+            st.metric("Colunas", len(df.columns))
+        with col3:
+            # Memória ocupada pelo DataFrame, sem serializar os dados
+            st.metric("Tamanho", f"{int(df.memory_usage(deep=True).sum()) / 1024:.1f} KB")
+        
+        # Download
+        st.subheader("📥 Download")
+        
+        if last_output["format"] == "csv":
+            st.download_button(
+                "⬇️ Download CSV",
+                last_output["download"],
+                file_name=Path(last_output["path"]).name,
+                mime="text/csv"
+            )
+        else:
+            st.download_button(
+                "⬇️ Download JSON",
+                last_output["download"],
+                file_name=Path(last_output["path"]).name,
+                mime="application/json"
+            )
 
 with tab2:
     st.subheader("📊 Histórico de Scraping")
@@ -325,38 +454,48 @@ with tab2:
     # Lista arquivos na pasta data
     data_dir = Path("data")
     if data_dir.exists():
-        files = sorted(data_dir.glob("scraping_*.csv"), reverse=True)
+        files = list_history(str(data_dir))
         
         if files:
             st.write(f"**Total de arquivos:** {len(files)}")
             
-            # Tabela de histórico
+            # Tabela de histórico (lista de dicts: dispensa o pandas)
             history_data = []
-            for file in files[:10]:  # Últimos 10
-                stat = file.stat()
+            for name, size, mtime in files[:10]:  # Últimos 10
                 history_data.append({
-                    "Arquivo": file.name,
-                    "Tamanho": f"{stat.st_size / 1024:.1f} KB",
-                    "Modificado": datetime.fromtimestamp(stat.st_mtime).strftime("%Y-%m-%d %H:%M:%S")
+                    "Arquivo": name,
+                    "Tamanho": f"{size / 1024:.1f} KB",
+                    "Modificado": datetime.fromtimestamp(mtime).strftime("%Y-%m-%d %H:%M:%S")
                 })
             
-            df_history = pd.DataFrame(history_data)
-            st.dataframe(df_history, use_container_width=True)
+            st.dataframe(history_data, use_container_width=True)
             
-            # Visualizar arquivo específico
-            selected_file = st.selectbox("Selecione um arquivo para visualizar:", [f.name for f in files])
+            # Visualizar arquivo específico (nada é lido até o usuário escolher)
+            mtimes = {name: mtime for name, _, mtime in files}
+            selected_file = st.selectbox(
+                "Selecione um arquivo para visualizar:",
+                list(mtimes),
+                index=None,
+                placeholder="Escolha um arquivo"
+            )
             
             if selected_file:
                 file_path = data_dir / selected_file
                 if file_path.suffix == ".csv":
-                    df = pd.read_csv(file_path)
-                    st.dataframe(df, use_container_width=True)
+                    df = load_csv(str(file_path), mtimes[selected_file])
+                    
+                    # Só o início vai para o navegador, a menos que o usuário peça tudo
+                    show_all = len(df) <= PREVIEW_ROWS or st.checkbox(
+                        f"Mostrar todas as {len(df)} linhas",
+                        value=False,
+                        help=f"Por padrão só as primeiras {PREVIEW_ROWS} linhas são exibidas"
+                    )
+                    st.dataframe(df if show_all else df.head(PREVIEW_ROWS), use_container_width=True)
                     
-                    # Download
-                    csv_data = df.to_csv(index=False)
+                    # Download: o próprio arquivo, sem reconverter o DataFrame
                     st.download_button(
                         "⬇️ Download",
-                        csv_data,
+                        read_bytes(str(file_path), mtimes[selected_file]),
                         file_name=selected_file,
                         mime="text/csv"
                     )
@@ -8,24 +8,21 @@ Uso básico:
     
 Com opções:
     python main.py --url "https://example.com" --headless --refine --output data/results.csv
+
+Várias URLs em paralelo:
+    python main.py --urls-file urls.txt --max-concurrency 5 --headless
 """
 
 import argparse
+import asyncio
 import logging
 import sys
 from pathlib import Path
 
-# Fix para Python 3.12+ com Playwright sync API
-import nest_asyncio
-nest_asyncio.apply()
-
-from dotenv import load_dotenv
-from agent.scraper import WebScraper
-from agent.storage import save_data
-from agent.llm_refiner import refine_data, OPENAI_AVAILABLE
+from agent.util import validate_url
 
-# Carrega variáveis de ambiente
-load_dotenv()
+# Playwright, OpenAI e companhia são importados só dentro de main(), para
+# que --help e erros de argumento respondam sem pagar esse custo
 
 # Configuração de logging
 LOG_DIR = Path("logs")
@@ -43,6 +40,19 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+def positive_int(value: str) -> int:
+    """Tipo do argparse para inteiros >= 1"""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"valor inteiro inválido: {value!r}")
+    
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"deve ser pelo menos 1: {number}")
+    
+    return number
+
+
 def parse_arguments():
     """Parse argumentos da linha de comando"""
     parser = argparse.ArgumentParser(
@@ -65,17 +75,37 @@ Exemplos de uso:
 
   # Modo headless
   python main.py --url "https://example.com" --headless
+
+  # Várias URLs (uma por linha) em paralelo
+  python main.py --urls-file urls.txt --max-concurrency 5 --headless
+
+  # Páginas estáticas sem navegador (cai no Playwright se vier pouco)
+  python main.py --url "https://news.ycombinator.com" --engine auto
         """
     )
     
-    # Argumentos obrigatórios
-    parser.add_argument(
+    # Argumentos obrigatórios (uma URL ou um arquivo de URLs)
+    target = parser.add_mutually_exclusive_group(required=True)
+    
+    target.add_argument(
         '--url',
         type=str,
-        required=True,
         help='URL alvo para scraping'
     )
     
+    target.add_argument(
+        '--urls-file',
+        type=str,
+        help='Arquivo com uma URL por linha, coletadas em paralelo'
+    )
+    
+    parser.add_argument(
+        '--max-concurrency',
+        type=positive_int,
+        default=5,
+        help='Máximo de páginas abertas ao mesmo tempo com --urls-file (padrão: 5)'
+    )
+    
     # Saída
     parser.add_argument(
         '--output',
@@ -93,12 +123,21 @@ Exemplos de uso:
     parser.add_argument(
         '--format',
         type=str,
-        choices=['csv', 'json'],
+        choices=['csv', 'json', 'jsonl'],
         default='csv',
         help='Formato do arquivo de saída (padrão: csv)'
     )
     
     # Navegação
+    parser.add_argument(
+        '--engine',
+        type=str,
+        choices=['auto', 'httpx', 'playwright'],
+        default='playwright',
+        help='httpx baixa só o HTML (rápido, sem JavaScript); auto tenta httpx '
+             'e usa o Playwright se vier pouco resultado (padrão: playwright)'
+    )
+    
     parser.add_argument(
         '--headless',
         action='store_true',
@@ -111,6 +150,24 @@ Exemplos de uso:
         help='Usa storage_state.json para autenticação'
     )
     
+    parser.add_argument(
+        '--block-resources',
+        action='store_true',
+        help='Não baixa imagens, fontes e mídia (páginas carregam mais rápido)'
+    )
+    
+    parser.add_argument(
+        '--profile',
+        type=str,
+        help='Diretório de perfil persistente do navegador (mantém login entre execuções)'
+    )
+    
+    parser.add_argument(
+        '--cdp-endpoint',
+        type=str,
+        help='Conecta a um Chromium já aberto via CDP (ex: http://localhost:9222, ver shared_browser.py)'
+    )
+    
     parser.add_argument(
         '--no-scroll',
         action='store_true',
@@ -162,10 +219,166 @@ Exemplos de uso:
     return parser.parse_args()
 
 
+def load_urls(path: str) -> list:
+    """
+    Lê as URLs de um arquivo (uma por linha).
+    
+    Linhas vazias e comentários (#) são ignorados, assim como URLs
+    inválidas (ver validate_url).
+    
+    Args:
+        path: Caminho do arquivo
+        
+    Returns:
+        Lista de URLs, sem repetições, na ordem do arquivo
+    """
+    urls = []
+    
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            url = line.strip()
+            if not url or url.startswith('#'):
+                continue
+            if not validate_url(url):
+                logger.warning(f"⚠️  URL inválida ignorada: {url}")
+                continue
+            urls.append(url)
+    
+    return list(dict.fromkeys(urls))
+
+
+def scrape_urls(urls: list, args, storage_state=None) -> list:
+    """
+    Coleta várias URLs em paralelo num único navegador (API assíncrona).
+    
+    Args:
+        urls: URLs alvo
+        args: Argumentos da linha de comando
+        storage_state: Caminho para arquivo de autenticação
+        
+    Returns:
+        Itens de todas as URLs, na ordem das URLs
+    """
+    from agent.scraper import scrape_many
+    
+    if args.cdp_endpoint or args.profile or args.screenshot:
+        logger.warning("⚠️  --cdp-endpoint, --profile e --screenshot são ignorados com --urls-file")
+    
+    if args.engine != 'playwright':
+        logger.warning("⚠️  --engine é ignorado com --urls-file (sempre Playwright)")
+    
+    results = asyncio.run(scrape_many(
+        urls,
+        concurrency=args.max_concurrency,
+        headless=args.headless,
+        storage_state=storage_state,
+        scroll=not args.no_scroll,
+        pause_time=args.scroll_pause,
+        max_items=args.max_items,
+        block_resources=blocked_resources(args)
+    ))
+    
+    for url, items in zip(urls, results):
+        logger.info(f"  {len(items):>4} itens de {url}")
+    
+    return [item for items in results for item in items]
+
+
+def scrape_static_page(args, storage_state=None):
+    """
+    Tenta coletar a URL só com HTTP (--engine httpx/auto).
+    
+    Args:
+        args: Argumentos da linha de comando
+        storage_state: Caminho para arquivo de autenticação
+        
+    Returns:
+        Lista de itens, ou None se o Playwright deve ser usado
+    """
+    if args.engine == 'playwright':
+        return None
+    
+    # Screenshot e perfil/CDP precisam de um navegador de verdade
+    if args.screenshot or args.profile or args.cdp_endpoint:
+        if args.engine == 'httpx':
+            logger.warning("⚠️  --screenshot, --profile e --cdp-endpoint exigem o Playwright; usando --engine playwright")
+        return None
+    
+    from agent.engines import scrape_static, HTTPX_ENGINE_AVAILABLE
+    
+    if not HTTPX_ENGINE_AVAILABLE:
+        logger.warning("⚠️  httpx/selectolax não instalados, usando Playwright (pip install httpx selectolax)")
+        return None
+    
+    data = scrape_static(args.url, max_items=args.max_items, storage_state=storage_state)
+    
+    if args.engine == 'httpx':
+        return data
+    
+    # auto: pouco resultado costuma indicar página renderizada via JavaScript
+    expected = max(1, (args.max_items or 2) // 2)
+    if len(data) >= expected:
+        logger.info(f"⚡ Página estática: {len(data)} itens sem abrir o navegador")
+        return data
+    
+    logger.info(f"↪️  HTML estático rendeu {len(data)} itens, usando Playwright")
+    return None
+
+
+def blocked_resources(args):
+    """Tipos de recurso a bloquear conforme --block-resources (None para nenhum)"""
+    if not args.block_resources:
+        return None
+    
+    from agent.scraper import DEFAULT_BLOCKED_RESOURCES
+    return DEFAULT_BLOCKED_RESOURCES
+
+
+async def save_outputs(data: list, args):
+    """
+    Salva o arquivo e o banco ao mesmo tempo, cada um numa thread.
+    
+    A serialização (CSV/JSON) e as escritas no SQLite são independentes;
+    em lotes grandes, uma não precisa esperar a outra.
+    
+    Args:
+        data: Itens a salvar
+        args: Argumentos da linha de comando
+    """
+    from agent.storage import save_data
+    
+    tasks = [asyncio.to_thread(save_data, data, output_path=args.output, format=args.format)]
+    if args.database:
+        tasks.append(asyncio.to_thread(save_data, data, database_path=args.database))
+    
+    await asyncio.gather(*tasks)
+
+
+def log_preview(data: list):
+    """Mostra preview dos primeiros itens"""
+    logger.info("\n📋 Preview dos dados:")
+    for i, item in enumerate(data[:3], 1):
+        title = item.get('title', 'Sem título')[:60]
+        logger.info(f"  {i}. {title}...")
+    
+    if len(data) > 3:
+        logger.info(f"  ... e mais {len(data) - 3} itens")
+
+
 def main():
     """Função principal"""
     args = parse_arguments()
     
+    # Fix para Python 3.12+ com Playwright sync API
+    import nest_asyncio
+    nest_asyncio.apply()
+    
+    from dotenv import load_dotenv
+    from agent.scraper import WebScraper
+    
+    # Carrega variáveis de ambiente
+    load_dotenv()
+    
     # Ajusta nível de log
     if args.verbose:
         logging.getLogger().setLevel(logging.DEBUG)
@@ -173,13 +386,28 @@ def main():
     logger.info("=" * 60)
     logger.info("🕷️  PLAYWRIGHT WEB SCRAPER")
     logger.info("=" * 60)
-    logger.info(f"URL alvo: {args.url}")
+    if args.urls_file:
+        logger.info(f"Arquivo de URLs: {args.urls_file}")
+    else:
+        logger.info(f"URL alvo: {args.url}")
     logger.info(f"Modo headless: {args.headless}")
     logger.info(f"Output: {args.output}")
     
     # Validação
-    if not args.url.startswith('http'):
-        logger.error("❌ URL inválida. Deve começar com http:// ou https://")
+    urls = None
+    if args.urls_file:
+        if not Path(args.urls_file).exists():
+            logger.error(f"❌ Arquivo de URLs não encontrado: {args.urls_file}")
+            sys.exit(1)
+        
+        urls = load_urls(args.urls_file)
+        if not urls:
+            logger.error("❌ Nenhuma URL válida no arquivo")
+            sys.exit(1)
+        
+        logger.info(f"URLs: {len(urls)} (até {args.max_concurrency} em paralelo)")
+    elif not validate_url(args.url):
+        logger.error("❌ URL inválida. Deve começar com http:// ou https:// e ter um domínio")
         sys.exit(1)
     
     # Verifica storage_state
@@ -197,6 +425,9 @@ def main():
             sys.exit(1)
     
     # Verifica OpenAI se --refine
+    if args.refine:
+        from agent.llm_refiner import refine_data, OPENAI_AVAILABLE
+    
     if args.refine and not OPENAI_AVAILABLE:
         logger.error(
             "❌ OpenAI não disponível!\n"
@@ -208,43 +439,62 @@ def main():
         # Inicia scraping
         logger.info("\n🚀 Iniciando scraping...")
         
-        scraper = WebScraper(headless=args.headless)
-        scraper.start(storage_state=storage_state)
+        if urls:
+            data = scrape_urls(urls, args, storage_state)
+            
+            if not data:
+                logger.warning("⚠️  Nenhum dado coletado")
+                sys.exit(0)
+            
+            logger.info(f"✅ {len(data)} itens coletados de {len(urls)} URLs")
+            log_preview(data)
+        else:
+            data = scrape_static_page(args, storage_state)
+            
+            if data is not None:
+                if not data:
+                    logger.warning("⚠️  Nenhum dado coletado")
+                    sys.exit(0)
+                
+                logger.info(f"✅ {len(data)} itens coletados")
+                log_preview(data)
         
-        try:
-            # Navega para URL
-            if not scraper.navigate(args.url):
-                logger.error("❌ Falha ao carregar página")
-                sys.exit(1)
+        if data is None:
+            scraper = WebScraper(
+                headless=args.headless,
+                cdp_endpoint=args.cdp_endpoint,
+                persistent_profile=args.profile,
+                block_resources=blocked_resources(args)
+            )
+            scraper.start(storage_state=storage_state)
             
-            # Scroll até o fim (se não desabilitado)
-            if not args.no_scroll:
-                scraper.scroll_to_bottom(pause_time=args.scroll_pause)
+            try:
+                # Navega para URL
+                if not scraper.navigate(args.url):
+                    logger.error("❌ Falha ao carregar página")
+                    sys.exit(1)
             
-            # Captura screenshot (se solicitado)
-            if args.screenshot:
-                scraper.screenshot(args.screenshot)
+                # Scroll até o fim (se não desabilitado)
+                if not args.no_scroll:
+                    scraper.scroll_to_bottom(pause_time=args.scroll_pause)
             
-            # Extrai dados
-            data = scraper.extract_data(max_items=args.max_items)
+                # Captura screenshot (se solicitado)
+                if args.screenshot:
+                    scraper.screenshot(args.screenshot)
             
-            if not data:
-                logger.warning("⚠️  Nenhum dado coletado")
-                sys.exit(0)
+                # Extrai dados
+                data = scraper.extract_data(max_items=args.max_items)
             
-            logger.info(f"✅ {len(data)} itens coletados")
+                if not data:
+                    logger.warning("⚠️  Nenhum dado coletado")
+                    sys.exit(0)
             
-            # Mostra preview dos primeiros itens
-            logger.info("\n📋 Preview dos dados:")
-            for i, item in enumerate(data[:3], 1):
-                title = item.get('title', 'Sem título')[:60]
-                logger.info(f"  {i}. {title}...")
+                logger.info(f"✅ {len(data)} itens coletados")
             
-            if len(data) > 3:
-                logger.info(f"  ... e mais {len(data) - 3} itens")
-        
-        finally:
-            scraper.close()
+                log_preview(data)
+            
+            finally:
+                scraper.close()
         
         # Refinamento com IA (opcional)
         if args.refine:
@@ -255,14 +505,9 @@ def main():
                 operation=args.refine_operation
             )
         
-        # Salva dados
+        # Salva dados (depois do refinamento, que altera os itens)
         logger.info("\n💾 Salvando dados...")
-        save_data(
-            data=data,
-            output_path=args.output,
-            database_path=args.database,
-            format=args.format
-        )
+        asyncio.run(save_outputs(data, args))
         
         # Resumo final
         logger.info("\n" + "=" * 60)
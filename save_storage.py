@@ -9,13 +9,21 @@ Uso:
     
 O navegador abrirá. Faça login manualmente e feche o navegador.
 O estado de autenticação será salvo em storage_state.json
+
+Várias contas/sites de uma vez (um navegador por URL):
+    python save_storage.py --url "https://a.com/login" --url "https://b.com/login"
+    
+Os estados são salvos em storage_state_1.json, storage_state_2.json, ...
 """
 
 import argparse
+import asyncio
+import json
 import logging
 import sys
 from pathlib import Path
-from playwright.sync_api import sync_playwright
+
+from agent.util import validate_url
 
 # Configuração de logging
 logging.basicConfig(
@@ -25,7 +33,20 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-def save_storage_state(url: str, output_path: str = "storage_state.json"):
+def write_state(state: dict, output_path: str):
+    """
+    Grava o storage_state em disco (mesmo formato de context.storage_state(path=...)).
+    
+    Args:
+        state: Estado retornado por context.storage_state()
+        output_path: Caminho do arquivo JSON
+    """
+    path = Path(output_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(state), encoding='utf-8')
+
+
+async def save_storage_state(url: str, output_path: str = "storage_state.json"):
     """
     Abre navegador para login manual e salva estado de autenticação.
     
@@ -33,26 +54,29 @@ def save_storage_state(url: str, output_path: str = "storage_state.json"):
         url: URL da página de login
         output_path: Caminho para salvar o storage_state.json
     """
+    # Importado aqui para que --help responda sem carregar o Playwright
+    from playwright.async_api import async_playwright
+    
     logger.info(f"Abrindo navegador para login em: {url}")
     logger.info("⚠️  Faça login manualmente e depois FECHE o navegador")
     
-    with sync_playwright() as p:
+    async with async_playwright() as p:
         # Inicia navegador em modo visível
-        browser = p.chromium.launch(headless=False)
+        browser = await p.chromium.launch(headless=False)
         
-        context = browser.new_context(
+        context = await browser.new_context(
             viewport={"width": 1280, "height": 720}
         )
         
-        page = context.new_page()
+        page = await context.new_page()
         
         try:
             # Navega para página de login
-            page.goto(url)
+            await page.goto(url)
             
             # Aguarda usuário fechar o navegador
             logger.info("✋ Aguardando você fazer login e fechar o navegador...")
-            page.wait_for_event("close", timeout=0)  # Sem timeout
+            await page.wait_for_event("close", timeout=0)  # Sem timeout
             
         except Exception as e:
             logger.info("Navegador fechado pelo usuário")
@@ -60,7 +84,11 @@ def save_storage_state(url: str, output_path: str = "storage_state.json"):
         finally:
             # Salva estado de autenticação
             try:
-                context.storage_state(path=output_path)
+                # Grava em disco numa thread, sem bloquear o loop (as
+                # outras URLs continuam sendo atendidas)
+                state = await context.storage_state()
+                await asyncio.to_thread(write_state, state, output_path)
+                
                 logger.info(f"✅ Estado de autenticação salvo em: {output_path}")
                 logger.info(f"📝 Tamanho: {Path(output_path).stat().st_size} bytes")
                 
@@ -70,9 +98,51 @@ def save_storage_state(url: str, output_path: str = "storage_state.json"):
                 
             except Exception as e:
                 logger.error(f"❌ Erro ao salvar storage_state: {str(e)}")
-                sys.exit(1)
+                raise
             
-            browser.close()
+            finally:
+                await browser.close()
+
+
+def output_paths(output: str, count: int) -> list:
+    """
+    Caminhos de saída para `count` URLs.
+    
+    Uma URL usa `output` como está; várias recebem um sufixo numérico
+    (storage_state.json -> storage_state_1.json, storage_state_2.json, ...).
+    
+    Args:
+        output: Caminho base
+        count: Número de URLs
+        
+    Returns:
+        Lista de caminhos
+    """
+    if count == 1:
+        return [output]
+    
+    path = Path(output)
+    return [str(path.with_name(f"{path.stem}_{i}{path.suffix}")) for i in range(1, count + 1)]
+
+
+async def save_storage_states(urls: list, output: str):
+    """
+    Abre um navegador por URL, ao mesmo tempo, e salva cada estado.
+    
+    Args:
+        urls: URLs das páginas de login
+        output: Caminho base dos arquivos de saída
+    """
+    paths = output_paths(output, len(urls))
+    
+    results = await asyncio.gather(
+        *(save_storage_state(url, path) for url, path in zip(urls, paths)),
+        return_exceptions=True
+    )
+    
+    failed = [url for url, result in zip(urls, results) if isinstance(result, Exception)]
+    if failed:
+        raise RuntimeError(f"storage_state não salvo para: {', '.join(failed)}")
 
 
 def main():
@@ -83,27 +153,30 @@ def main():
     parser.add_argument(
         '--url',
         type=str,
+        action='append',
         required=True,
-        help='URL da página de login'
+        help='URL da página de login (repita para várias contas/sites)'
     )
     
     parser.add_argument(
         '--output',
         type=str,
         default='storage_state.json',
-        help='Caminho do arquivo de saída (padrão: storage_state.json)'
+        help='Caminho do arquivo de saída (padrão: storage_state.json; '
+             'com várias URLs recebe sufixo _1, _2, ...)'
     )
     
     args = parser.parse_args()
     
     # Validação
-    if not args.url.startswith('http'):
-        logger.error("❌ URL inválida. Deve começar com http:// ou https://")
+    invalid = [url for url in args.url if not validate_url(url)]
+    if invalid:
+        logger.error(f"❌ URL inválida: {invalid[0]}. Deve começar com http:// ou https:// e ter um domínio")
         sys.exit(1)
     
     # Executa
     try:
-        save_storage_state(args.url, args.output)
+        asyncio.run(save_storage_states(args.url, args.output))
     except KeyboardInterrupt:
         logger.info("\n⚠️  Operação cancelada pelo usuário")
         sys.exit(0)
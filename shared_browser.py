@@ -0,0 +1,125 @@
+"""
+Shared Browser Script
+
+Script para manter um navegador Chromium aberto e compartilhado
+entre vários scrapers via CDP (Chrome DevTools Protocol).
+Evita iniciar um navegador novo a cada execução.
+
+Uso:
+    python shared_browser.py --port 9222
+
+Em outro terminal, conecte os scrapers ao endpoint exibido:
+    python main.py --url "https://example.com" --cdp-endpoint http://localhost:9222
+
+Pressione Ctrl+C para encerrar o navegador.
+"""
+
+import argparse
+import json
+import logging
+import sys
+import time
+from urllib.request import urlopen
+
+# Configuração de logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def get_ws_endpoint(port: int, retries: int = 20) -> str:
+    """
+    Lê o WebSocket de debug do navegador em /json/version.
+    
+    Args:
+        port: Porta de remote debugging
+        retries: Tentativas (a cada 0.25s) enquanto a porta não responde
+    
+    Returns:
+        URL ws:// do navegador
+    """
+    url = f"http://localhost:{port}/json/version"
+    
+    for attempt in range(retries):
+        try:
+            with urlopen(url, timeout=2) as response:
+                return json.load(response)['webSocketDebuggerUrl']
+        except OSError:
+            if attempt == retries - 1:
+                raise
+            time.sleep(0.25)
+
+
+def run_shared_browser(port: int = 9222, headless: bool = True):
+    """
+    Inicia o Chromium com remote debugging e o mantém aberto.
+    
+    Args:
+        port: Porta de remote debugging
+        headless: Se True, executa sem interface gráfica
+    """
+    # Importado aqui para que --help responda sem carregar o Playwright
+    from playwright.sync_api import sync_playwright
+    
+    logger.info(f"Iniciando Chromium compartilhado (porta {port}, headless={headless})")
+    
+    with sync_playwright() as p:
+        browser = p.chromium.launch(
+            headless=headless,
+            args=[f"--remote-debugging-port={port}"]
+        )
+        
+        try:
+            ws_endpoint = get_ws_endpoint(port)
+            
+            logger.info("✅ Navegador pronto")
+            logger.info(f"   HTTP: http://localhost:{port}")
+            logger.info(f"   WS:   {ws_endpoint}")
+            logger.info("\n💡 Para usar este navegador, execute:")
+            logger.info(f"   python main.py --url <URL> --cdp-endpoint http://localhost:{port}")
+            logger.info("✋ Pressione Ctrl+C para encerrar")
+            
+            # Mantém o processo vivo enquanto o navegador estiver conectado
+            while browser.is_connected():
+                time.sleep(1)
+        
+        finally:
+            if browser.is_connected():
+                browser.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Mantém um Chromium aberto para ser compartilhado via CDP"
+    )
+    
+    parser.add_argument(
+        '--port',
+        type=int,
+        default=9222,
+        help='Porta de remote debugging (padrão: 9222)'
+    )
+    
+    parser.add_argument(
+        '--headed',
+        action='store_true',
+        help='Exibe a janela do navegador'
+    )
+    
+    args = parser.parse_args()
+    
+    # Executa
+    try:
+        run_shared_browser(args.port, headless=not args.headed)
+    except KeyboardInterrupt:
+        logger.info("\n⚠️  Navegador compartilhado encerrado")
+        sys.exit(0)
+    except Exception as e:
+        logger.error(f"❌ Erro: {str(e)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+"""Configuração do pytest: importa o pacote agent a partir da raiz do repositório e fornece o navegador dos testes de extração"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+@pytest.fixture(scope="session")
+def browser():
+    """Chromium headless do Playwright (pula o teste se não estiver instalado)"""
+    sync_api = pytest.importorskip("playwright.sync_api")
+    
+    with sync_api.sync_playwright() as p:
+        try:
+            browser = p.chromium.launch(headless=True)
+        except Exception as e:
+            pytest.skip(f"Chromium indisponível: {e}")
+        
+        yield browser
+        browser.close()
+
+
+@pytest.fixture
+def dom_page(browser):
+    """Página nova num contexto isolado"""
+    context = browser.new_context()
+    page = context.new_page()
+    
+    yield page
+    
+    context.close()
@@ -0,0 +1,42 @@
+"""Testes da BrowserThread (pool falso, sem navegador)"""
+
+import threading
+
+import pytest
+
+pytest.importorskip("playwright.sync_api")
+
+from agent.browser_pool import BrowserThread  # noqa: E402
+
+
+class FakePool:
+    """Registra em qual thread o close() foi chamado"""
+    
+    def __init__(self):
+        self.closed_in = None
+    
+    def close(self):
+        self.closed_in = threading.current_thread()
+
+
+def test_submit_roda_na_thread_dedicada():
+    worker = BrowserThread(pool=FakePool(), name="teste")
+    try:
+        assert worker.submit(lambda: threading.current_thread().name).result() == "teste"
+        
+        with pytest.raises(ValueError):
+            worker.submit(int, "abc").result()
+    finally:
+        worker.shutdown()
+
+
+def test_shutdown_fecha_o_pool_na_propria_thread():
+    pool = FakePool()
+    worker = BrowserThread(pool=pool, name="teste")
+    thread = worker.submit(threading.current_thread).result()
+    
+    worker.shutdown()
+    
+    assert pool.closed_in is thread
+    with pytest.raises(RuntimeError):
+        worker.submit(print)
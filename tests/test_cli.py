@@ -0,0 +1,34 @@
+"""Testes da validação de argumentos do main.py (rodam antes de abrir o navegador)"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+MAIN = Path(__file__).resolve().parent.parent / "main.py"
+
+
+def run_cli(tmp_path, *args):
+    return subprocess.run(
+        [sys.executable, str(MAIN), *args],
+        cwd=tmp_path,
+        capture_output=True,
+        text=True,
+        timeout=30
+    )
+
+
+@pytest.mark.parametrize("value", ["0", "-3", "abc"])
+def test_max_concurrency_invalido(tmp_path, value):
+    result = run_cli(tmp_path, "--urls-file", "urls.txt", "--max-concurrency", value)
+    
+    assert result.returncode == 2
+    assert "--max-concurrency" in result.stderr
+
+
+def test_help_lista_max_concurrency(tmp_path):
+    result = run_cli(tmp_path, "--help")
+    
+    assert result.returncode == 0
+    assert "--max-concurrency" in result.stdout
@@ -0,0 +1,60 @@
+"""Testes dos scripts de extração executados no navegador (_EXTRACT_JS e cache de seletores)"""
+
+from agent.scraper import _EXTRACT_JS, _SELECTOR_CACHE_JS, WebScraper
+
+SELECTORS = dict(WebScraper.SELECTORS)
+
+
+def extract(page, **selectors):
+    sel = {**SELECTORS, **selectors}
+    return page.evaluate(_EXTRACT_JS, {"sel": sel, "fallbacks": [], "maxItems": None})
+
+
+def test_cache_invalidado_por_troca_de_classe(dom_page):
+    dom_page.set_content("""
+        <div class="item active"><h2>Primeiro</h2></div>
+        <div class="item"><h2>Segundo</h2></div>
+    """)
+    dom_page.add_script_tag(content=_SELECTOR_CACHE_JS)
+    
+    first = extract(dom_page, container=".item.active", title="h2")
+    assert [item["title"] for item in first["items"]] == ["Primeiro"]
+    
+    # Re-renderização que só troca atributos (nenhum nó entra ou sai)
+    dom_page.evaluate("""() => {
+        const [a, b] = document.querySelectorAll('.item');
+        a.classList.remove('active');
+        b.classList.add('active');
+    }""")
+    
+    second = extract(dom_page, container=".item.active", title="h2")
+    assert [item["title"] for item in second["items"]] == ["Segundo"]
+
+
+def test_seletor_com_scope_relativo_ao_container(dom_page):
+    dom_page.set_content("""
+        <article>
+            <h2>Fora</h2>
+            <div class="body"><h2>Dentro</h2><p>Texto</p></div>
+        </article>
+    """)
+    
+    result = extract(
+        dom_page,
+        container="article",
+        title=":scope > .body > h2",
+        content=":scope > .body > p"
+    )
+    
+    assert result["items"] == [{"title": "Dentro", "content": "Texto"}]
+
+
+def test_scope_junto_com_seletores_comuns(dom_page):
+    dom_page.set_content("""
+        <article><span class="author">Ana</span><div><h2>Título</h2></div></article>
+    """)
+    
+    result = extract(dom_page, container="article", title=":scope > div > h2", author=".author")
+    
+    assert result["items"][0]["title"] == "Título"
+    assert result["items"][0]["author"] == "Ana"
@@ -0,0 +1,66 @@
+"""Testes do HttpxScraper sobre HTML fixo (sem rede)"""
+
+import pytest
+
+pytest.importorskip("httpx")
+pytest.importorskip("selectolax")
+
+from agent.engines.httpx_engine import HttpxScraper  # noqa: E402
+
+HTML = """
+<html><body>
+  <article>
+    <h2 class="title"><a href="/posts/1">Primeiro   post</a></h2>
+    <span class="author">Ana</span>
+    <time datetime="2024-01-02">2 de janeiro</time>
+    <p class="content">Conteúdo <b>um</b></p>
+  </article>
+  <article>
+    <h2 class="title">Sem link</h2>
+  </article>
+  <article>
+    <span class="author">Sem título nem link</span>
+  </article>
+</body></html>
+"""
+
+HN_HTML = """
+<table>
+  <tr class="athing"><td><span class="titleline"><a href="item?id=1">Notícia</a></span></td></tr>
+  <tr class="athing"><td><span class="titleline"><a href="https://example.com/">Externa</a></span></td></tr>
+</table>
+"""
+
+
+@pytest.fixture
+def scraper():
+    with HttpxScraper() as scraper:
+        yield scraper
+
+
+def test_extrai_campos_e_resolve_links(scraper):
+    data = scraper.extract_data(HTML, "https://blog.example.com/lista")
+    
+    assert data == [
+        {
+            "title": "Primeiro post",
+            "link": "https://blog.example.com/posts/1",
+            "author": "Ana",
+            "date": "2024-01-02",
+            "content": "Conteúdo um",
+        },
+        {"title": "Sem link"},
+    ]
+
+
+def test_max_items(scraper):
+    assert len(scraper.extract_data(HTML, "https://blog.example.com/", max_items=1)) == 1
+
+
+def test_usa_template_do_site(scraper):
+    data = scraper.extract_data(HN_HTML, "https://news.ycombinator.com/")
+    
+    assert [item["link"] for item in data] == [
+        "https://news.ycombinator.com/item?id=1",
+        "https://example.com/",
+    ]
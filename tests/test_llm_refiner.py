@@ -0,0 +1,138 @@
+"""Testes do LLMRefiner (cliente OpenAI substituído por um falso, sem rede)"""
+
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import pytest
+
+from agent import llm_refiner
+
+
+class FakeAsyncOpenAI:
+    """Imita o AsyncOpenAI: responde sempre 'resumo' e registra o close()"""
+    
+    instances = []
+    
+    def __init__(self, api_key=None):
+        self.closed = False
+        self.calls = []
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+        FakeAsyncOpenAI.instances.append(self)
+    
+    async def _create(self, **kwargs):
+        self.calls.append(kwargs)
+        message = SimpleNamespace(content="resumo")
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+    
+    async def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def refiner(monkeypatch):
+    FakeAsyncOpenAI.instances = []
+    monkeypatch.setattr(llm_refiner, "OPENAI_AVAILABLE", True)
+    monkeypatch.setattr(llm_refiner, "OpenAI", lambda api_key=None: None, raising=False)
+    monkeypatch.setattr(llm_refiner, "AsyncOpenAI", FakeAsyncOpenAI, raising=False)
+    return llm_refiner.LLMRefiner(api_key="test")
+
+
+def test_refine_batch_sem_loop(refiner):
+    data = refiner.refine_batch([{"content": "texto longo"}])
+    
+    assert data[0]["content_summary"] == "resumo"
+
+
+def test_refine_batch_com_loop_rodando(refiner):
+    async def chamador():
+        # Chamada síncrona de dentro de um loop ativo (como após o Playwright sync)
+        return refiner.refine_batch([{"content": "texto longo"}])
+    
+    data = asyncio.run(chamador())
+    
+    assert data[0]["content_summary"] == "resumo"
+
+
+def test_refine_batch_textos_iguais_uma_chamada(refiner):
+    data = refiner.refine_batch([{"content": "igual"}, {"content": "igual"}, {"content": "igual"}])
+    
+    calls = [call for client in FakeAsyncOpenAI.instances for call in client.calls]
+    assert len(calls) == 1
+    assert [item["content_summary"] for item in data] == ["resumo"] * 3
+
+
+def test_refine_batch_fecha_cliente(refiner):
+    refiner.refine_batch([{"content": "a"}])
+    refiner.refine_batch([{"content": "b"}])
+    
+    assert len(FakeAsyncOpenAI.instances) == 2
+    assert all(client.closed for client in FakeAsyncOpenAI.instances)
+
+
+def test_refine_batch_em_threads(refiner):
+    # Mesma instância usada por várias threads (como a de _get_refiner)
+    def worker(n):
+        return refiner.refine_batch([{"content": f"texto {n}-{i}"} for i in range(20)])
+    
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(worker, range(8)))
+    
+    assert all(item["content_summary"] == "resumo" for data in results for item in data)
+    assert len(FakeAsyncOpenAI.instances) == 8
+    assert all(client.closed for client in FakeAsyncOpenAI.instances)
+
+
+def test_parse_key_points_sem_espaco_apos_numero():
+    result = "1.Primeiro\n2) Segundo\n3-Terceiro\n- Quarto\n•Quinto"
+    
+    assert llm_refiner._parse_key_points(result) == [
+        "Primeiro", "Segundo", "Terceiro", "Quarto", "Quinto"
+    ]
+
+
+class FakeBatchOpenAI:
+    """Imita files/batches do OpenAI: responde cada linha do JSONL enviado"""
+    
+    def __init__(self):
+        self.uploaded = None
+        self.files = SimpleNamespace(create=self._upload, content=self._content)
+        self.batches = SimpleNamespace(create=self._create_batch, retrieve=None)
+    
+    def _upload(self, file, purpose):
+        assert purpose == "batch"
+        self.uploaded = file[1].decode("utf-8")
+        return SimpleNamespace(id="file-in")
+    
+    def _create_batch(self, input_file_id, endpoint, completion_window):
+        assert input_file_id == "file-in"
+        return SimpleNamespace(id="batch-1", status="completed", output_file_id="file-out")
+    
+    def _content(self, file_id):
+        assert file_id == "file-out"
+        requests = [json.loads(line) for line in self.uploaded.splitlines()]
+        lines = []
+        # Saída fora de ordem: o custom_id é que liga resposta e item
+        for request in reversed(requests):
+            text = request["body"]["messages"][-1]["content"].rsplit("\n", 1)[-1]
+            body = {"choices": [{"message": {"content": f" resumo de {text} "}}]}
+            lines.append(json.dumps({
+                "custom_id": request["custom_id"],
+                "response": {"status_code": 200, "body": body},
+            }))
+        return SimpleNamespace(text="\n".join(lines))
+
+
+def test_refine_batch_large_ida_e_volta(refiner):
+    refiner.client = FakeBatchOpenAI()
+    data = [{"content": "a"}, {"content": ""}, {"content": "b"}]
+    
+    refiner.refine_batch_large(data, threshold=1)
+    
+    requests = [json.loads(line) for line in refiner.client.uploaded.splitlines()]
+    assert [request["custom_id"] for request in requests] == ["0", "2"]
+    assert all(request["url"] == "/v1/chat/completions" for request in requests)
+    assert data[0]["content_summary"] == "resumo de a"
+    assert "content_summary" not in data[1]
+    assert data[2]["content_summary"] == "resumo de b"
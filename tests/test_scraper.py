@@ -0,0 +1,118 @@
+"""Testes do WebScraper que não precisam de navegador"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("playwright.sync_api")
+
+from agent.scraper import AsyncWebScraper, WebScraper, scrape_many  # noqa: E402
+
+
+class FailingPage:
+    """Página cuja navegação sempre falha"""
+    
+    url = "https://antiga.example.com/lista"
+    
+    def goto(self, url, wait_until=None):
+        raise TimeoutError("timeout")
+
+
+def test_navigate_com_falha_descarta_base_anterior():
+    scraper = WebScraper()
+    scraper.page = FailingPage()
+    scraper._base_url = "https://antiga.example.com/lista"
+    
+    assert scraper.navigate("https://nova.example.com/") is False
+    assert scraper._base_url is None
+
+
+def test_close_descarta_base():
+    scraper = WebScraper()
+    scraper._base_url = "https://antiga.example.com/lista"
+    
+    scraper.close()
+    
+    assert scraper._base_url is None
+
+
+class LoadedPage:
+    """Página que carrega e registra os seletores esperados"""
+    
+    def __init__(self, url):
+        self.url = url
+        self.waited = []
+    
+    def goto(self, url, wait_until=None):
+        return SimpleNamespace(ok=True, status=200)
+    
+    def wait_for_selector(self, selector, state=None, timeout=None):
+        self.waited.append(selector)
+    
+    def title(self):
+        return "Página"
+
+
+def test_navigate_espera_container_do_template():
+    scraper = WebScraper()
+    scraper.page = LoadedPage("https://news.ycombinator.com/")
+    
+    assert scraper.navigate("https://news.ycombinator.com/") is True
+    assert scraper.page.waited == [".athing, tr.athing"]
+
+
+def test_navigate_sem_template_nao_espera_seletor_padrao():
+    scraper = WebScraper()
+    scraper.page = LoadedPage("https://desconhecido.example.com/")
+    
+    assert scraper.navigate("https://desconhecido.example.com/") is True
+    assert scraper.page.waited == []
+
+
+def test_navigate_espera_seletor_customizado():
+    scraper = WebScraper()
+    scraper.SELECTORS['container'] = '.card'
+    scraper.page = LoadedPage("https://desconhecido.example.com/")
+    
+    assert scraper.navigate("https://desconhecido.example.com/") is True
+    assert scraper.page.waited == [".card"]
+
+
+class FakeAsyncResource:
+    """Contexto/navegador/Playwright falso da API assíncrona"""
+    
+    def __init__(self):
+        self.closed = False
+    
+    async def close(self):
+        self.closed = True
+    
+    async def stop(self):
+        self.closed = True
+
+
+def test_async_close_descarta_recursos():
+    scraper = AsyncWebScraper()
+    resources = [FakeAsyncResource() for _ in range(3)]
+    scraper.context, scraper.browser, scraper.playwright = resources
+    
+    asyncio.run(scraper.close())
+    asyncio.run(scraper.close())
+    
+    assert all(resource.closed for resource in resources)
+    assert (scraper.context, scraper.browser, scraper.playwright) == (None, None, None)
+
+
+def test_scrape_many_fecha_se_start_falhar(monkeypatch):
+    playwright = FakeAsyncResource()
+    
+    async def failing_start(self, storage_state=None):
+        self.playwright = playwright
+        raise RuntimeError("navegador não instalado")
+    
+    monkeypatch.setattr(AsyncWebScraper, "start", failing_start)
+    
+    with pytest.raises(RuntimeError):
+        asyncio.run(scrape_many(["https://example.com/"]))
+    assert playwright.closed
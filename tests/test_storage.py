@@ -0,0 +1,98 @@
+"""Testes do módulo de armazenamento (CSV e SQLite)"""
+
+import csv
+import sqlite3
+import threading
+
+import pytest
+
+from agent import storage
+from agent.storage import AsyncSQLiteStorage, CSVStorage
+
+ITEMS = [{"title": "A", "link": "https://a.example.com"}, {"title": "B", "link": "https://b.example.com"}]
+
+
+def call_with_timeout(fn, timeout=5.0):
+    """Executa fn numa thread; falha o teste se ela travar"""
+    outcome = {}
+    
+    def target():
+        try:
+            outcome["result"] = fn()
+        except BaseException as e:
+            outcome["error"] = e
+    
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+    thread.join(timeout)
+    assert not thread.is_alive(), f"{fn.__name__} travou"
+    
+    if "error" in outcome:
+        raise outcome["error"]
+    return outcome.get("result")
+
+
+def test_grava_e_conta(tmp_path):
+    db_path = tmp_path / "dados.db"
+    
+    with AsyncSQLiteStorage(str(db_path), flush_interval=0.01) as db:
+        db.save(ITEMS)
+        db.save(ITEMS[:1])
+        db.flush()
+    
+    assert db.inserted == 2
+    assert db.duplicates == 1
+    assert sqlite3.connect(db_path).execute("SELECT COUNT(*) FROM scraped_data").fetchone() == (2,)
+
+
+def test_erro_inesperado_nao_trava_flush_nem_close(tmp_path, monkeypatch):
+    def broken_insert(self, rows):
+        raise TypeError("item com formato inesperado")
+    
+    monkeypatch.setattr(storage.SQLiteStorage, "_insert", broken_insert)
+    
+    db = AsyncSQLiteStorage(str(tmp_path / "dados.db"), flush_interval=0.01)
+    db.save(ITEMS)
+    
+    with pytest.raises(TypeError):
+        call_with_timeout(db.flush)
+    
+    # A thread continua viva e drenando a fila
+    db.save(ITEMS)
+    
+    with pytest.raises(TypeError):
+        call_with_timeout(db.close)
+
+
+def test_csv_append_com_colunas_novas_amplia_cabecalho(tmp_path):
+    path = tmp_path / "dados.csv"
+    CSVStorage.save(ITEMS, str(path))
+    
+    CSVStorage.save([{"title": "C", "link": "https://c.example.com", "content_summary": "resumo"}], str(path), append=True)
+    
+    with open(path, newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    
+    assert [row["title"] for row in rows] == ["A", "B", "C"]
+    assert [row["content_summary"] for row in rows] == ["", "", "resumo"]
+
+
+def test_links_repetidos_viram_uma_linha(tmp_path):
+    db_path = tmp_path / "dados.db"
+    data = [
+        {"title": "A", "link": "https://a.example.com"},
+        {"title": "A de novo", "link": "https://a.example.com"},
+        {"title": "Sem link"},
+        {"title": "Sem link"},
+    ]
+    
+    db = storage.SQLiteStorage(str(db_path))
+    db.save(data)
+    db.save(data[:2])
+    rows = db.conn.execute("SELECT title FROM scraped_data WHERE link IS NOT NULL").fetchall()
+    total = db.count()
+    db.close()
+    
+    # O primeiro item do link fica; itens sem link não são deduplicados
+    assert rows == [("A",)]
+    assert total == 3